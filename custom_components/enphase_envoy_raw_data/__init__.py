@@ -17,13 +17,29 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
-from homeassistant.const import CONF_HOST
+from homeassistant.components import zeroconf
+from homeassistant.const import CONF_HOST, EVENT_HOMEASSISTANT_CLOSE
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from pyenphase import Envoy
 
-from .const import DOMAIN, UNIQUE_ID
+from .cache import cache_store
+from .connection import EnvoyConnectionPool
+from .const import (
+    CONF_FULL_UPDATE,
+    CONF_HISTORY_SIZE,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_METER_STREAM,
+    CONF_STREAM_BUCKET,
+    CONF_STREAM_INTERVAL,
+    CONF_WATCH_ENDPOINTS,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_STREAM_BUCKET,
+    DEFAULT_STREAM_INTERVAL,
+    DOMAIN,
+    MAX_CONCURRENT_REQUESTS,
+    UNIQUE_ID,
+)
 from .coordinator import EnphaseRawDataConfigEntry, EnphaseRawDataUpdateCoordinator
 from .services import setup_hass_services
 
@@ -47,11 +63,28 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Enphase Envoy raw data support from a config entry."""
     host = entry.data[CONF_HOST]
-    session = async_create_clientsession(hass, verify_ssl=False)
-    envoy = Envoy(host, session)
-    coordinator = EnphaseRawDataUpdateCoordinator(hass, envoy, entry)
-
-    # wait for one pyenphase data collection cycle to establish communication
+    meter_stream = entry.options.get(CONF_METER_STREAM, False)
+    # dedicated connections to reuse, one more than scheduled requests
+    # for the unscheduled communication check and authentication and
+    # one for the meter stream
+    pool = EnvoyConnectionPool(
+        entry.options.get(CONF_MAX_CONCURRENT_REQUESTS, MAX_CONCURRENT_REQUESTS)
+        + 1
+        + meter_stream,
+        await zeroconf.async_get_async_instance(hass),
+    )
+    entry.async_on_unload(pool.async_close)
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, pool.async_close)
+    )
+    envoy = Envoy(host, pool.session)
+    # requests are retried by the coordinator retry policy only
+    envoy.set_retry_policy(max_attempts=1)
+    coordinator = EnphaseRawDataUpdateCoordinator(hass, envoy, entry, pool)
+    # restore cache from before restart so cached data is available right away
+    await coordinator.async_load_cache()
+
+    # wait for setup, authentication and one probe request to establish communication
     await coordinator.async_config_entry_first_refresh()
     if not entry.unique_id:
         hass.config_entries.async_update_entry(
@@ -77,6 +110,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
 
     entry.runtime_data = coordinator
+    coordinator.async_start_watch(
+        entry.options.get(CONF_WATCH_ENDPOINTS, {}),
+        entry.options.get(CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE),
+    )
+    if meter_stream:
+        coordinator.async_start_stream(
+            entry.options.get(CONF_STREAM_INTERVAL, DEFAULT_STREAM_INTERVAL),
+            entry.options.get(CONF_STREAM_BUCKET, DEFAULT_STREAM_BUCKET),
+        )
+    if entry.options.get(CONF_FULL_UPDATE, False):
+        # collect all pyenphase data in the background to pre-fill the cache
+        entry.async_create_background_task(
+            hass, coordinator.async_update_all(), f"{entry.title} full update"
+        )
 
     # Reload entry when it is updated.
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
@@ -98,4 +145,13 @@ async def async_unload_entry(
     # cancel scheduled functions
     coordinator.async_cancel_token_refresh()
     coordinator.async_cancel_firmware_refresh()
+    coordinator.async_cancel_watch()
+    coordinator.async_stop_stream()
+    # store cache now as a reload starts with loading it
+    await coordinator.async_save_cache()
     return True
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove stored cache when the config entry is removed."""
+    await cache_store(hass, entry.entry_id).async_remove()
@@ -0,0 +1,137 @@
+"""
+Meter reading aggregation for Enphase Envoy Raw Data Support.
+
+This custom integration registers an enphase_envoy_raw_data integration
+that only provides a read_data(endpoint) and send_data(endpoint,data)
+action/service. No entities are provided.
+
+!!! SENDING DATA TO AN ENVOY ENDPOINT HAS RISK FOR PROPER OPERATION
+OF THE ENVOY. DOING SO IS AT YOUR OWN RISK AND SHOULD ONLY BE DONE
+FULLY UNDERSTANDING ANY EFFECT OF IT !!!
+
+This integration does not replace the core integration. It can be used next to it
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from .const import STREAM_READ_TIMEOUT
+
+# meter reading key holding active power in W
+POWER_KEY = "p"
+
+
+@dataclass(slots=True)
+class ValueStats:
+    """Statistics of 1 value in the readings of a bucket."""
+
+    minimum: float
+    maximum: float
+    total: float
+    last: float
+    count: int = 1
+    energy: float | None = None
+
+    def add(self, value: float) -> None:
+        """Add value of the next reading."""
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        self.total += value
+        self.last = value
+        self.count += 1
+
+    def as_dict(self) -> dict[str, float]:
+        """Return bucket summary of the value."""
+        summary = {
+            "min": self.minimum,
+            "max": self.maximum,
+            "mean": round(self.total / self.count, 3),
+            "last": self.last,
+        }
+        if self.energy is not None:
+            summary["energy"] = round(self.energy, 4)
+        return summary
+
+
+def _numeric_values(
+    data: dict[str, Any], path: tuple[str, ...] = ()
+) -> list[tuple[tuple[str, ...], float]]:
+    """Return path and value of all numbers in nested reading data."""
+    values: list[tuple[tuple[str, ...], float]] = []
+    for key, value in data.items():
+        if isinstance(value, dict):
+            values.extend(_numeric_values(value, (*path, key)))
+        elif isinstance(value, int | float) and not isinstance(value, bool):
+            values.append(((*path, key), value))
+    return values
+
+
+class MeterAggregator:
+    """
+    Aggregate meter readings into fixed time buckets.
+
+    Buckets of bucket seconds are aligned to the clock. For each
+    number in the readings a bucket summary has the min, max, mean and
+    last value. Power values also get the energy in Wh, integrated
+    from the readings, not across gaps where the stream was broken.
+    """
+
+    def __init__(self, bucket: float) -> None:
+        """Initialize aggregator for buckets of bucket seconds."""
+        self.bucket = bucket
+        self.buckets = 0
+        self._start: float | None = None
+        self._samples = 0
+        self._stats: dict[tuple[str, ...], ValueStats] = {}
+        self._power: dict[tuple[str, ...], tuple[float, float]] = {}
+
+    def add(self, reading: dict[str, Any], now: float) -> dict[str, Any] | None:
+        """Add reading received at now, return summary when a bucket completed."""
+        start = now - now % self.bucket
+        summary = None
+        if start != self._start:
+            if self._start is not None:
+                summary = self._summary(self._start)
+            self._start = start
+            self._samples = 0
+            self._stats = {}
+        self._samples += 1
+        for path, value in _numeric_values(reading):
+            if stats := self._stats.get(path):
+                stats.add(value)
+            else:
+                stats = self._stats[path] = ValueStats(
+                    value,
+                    value,
+                    value,
+                    value,
+                    energy=0.0 if path[-1] == POWER_KEY else None,
+                )
+            if stats.energy is None:
+                continue
+            if (previous := self._power.get(path)) and (
+                elapsed := now - previous[0]
+            ) <= STREAM_READ_TIMEOUT:
+                # trapezoid rule, W * s to Wh
+                stats.energy += (previous[1] + value) / 2 * elapsed / 3600
+            self._power[path] = (now, value)
+        return summary
+
+    def _summary(self, start: float) -> dict[str, Any]:
+        """Return summary of the bucket starting at start."""
+        self.buckets += 1
+        data: dict[str, Any] = {}
+        for path, stats in self._stats.items():
+            node = data
+            for key in path[:-1]:
+                node = node.setdefault(key, {})
+            node[path[-1]] = stats.as_dict()
+        return {
+            "start": datetime.fromtimestamp(start, UTC).isoformat(),
+            "end": datetime.fromtimestamp(start + self.bucket, UTC).isoformat(),
+            "samples": self._samples,
+            "data": data,
+        }
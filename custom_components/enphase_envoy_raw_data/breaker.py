@@ -0,0 +1,101 @@
+"""
+Circuit breaker for Enphase Envoy Raw Data Support.
+
+This custom integration registers an enphase_envoy_raw_data integration
+that only provides a read_data(endpoint) and send_data(endpoint,data)
+action/service. No entities are provided.
+
+!!! SENDING DATA TO AN ENVOY ENDPOINT HAS RISK FOR PROPER OPERATION
+OF THE ENVOY. DOING SO IS AT YOUR OWN RISK AND SHOULD ONLY BE DONE
+FULLY UNDERSTANDING ANY EFFECT OF IT !!!
+
+This integration does not replace the core integration. It can be used next to it
+"""
+
+from __future__ import annotations
+
+import logging
+from enum import StrEnum
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+from pyenphase import EnvoyError
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EnvoyUnavailableError(EnvoyError):
+    """Request not sent as the envoy is considered unreachable."""
+
+
+class BreakerState(StrEnum):
+    """State of the envoy circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class EnvoyCircuitBreaker:
+    """
+    Stop sending requests to an envoy that is not reachable.
+
+    The breaker opens after failure_threshold consecutive connection
+    failures and requests fail right away. After reset_timeout seconds
+    it is half open and allows 1 request per reset_timeout to probe the
+    envoy. A request reaching the envoy closes the breaker again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float) -> None:
+        """Initialize closed circuit breaker."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = BreakerState.CLOSED
+        self.consecutive_failures = 0
+        self.transitions: dict[str, int] = {state.value: 0 for state in BreakerState}
+        self._last_attempt = 0.0
+
+    def _transition(self, state: BreakerState) -> None:
+        """Change breaker state and count the transition."""
+        if state is self.state:
+            return
+        _LOGGER.debug("%s: circuit breaker %s -> %s", self.name, self.state, state)
+        self.state = state
+        self.transitions[state.value] += 1
+
+    def allow(self) -> bool:
+        """Return True if a request can be sent to the envoy."""
+        if self.state is BreakerState.CLOSED:
+            return True
+        now = dt_util.utcnow().timestamp()
+        if now - self._last_attempt < self.reset_timeout:
+            return False
+        # let this request probe the envoy
+        self._transition(BreakerState.HALF_OPEN)
+        self._last_attempt = now
+        return True
+
+    def record_success(self) -> None:
+        """Record a request that reached the envoy."""
+        self.consecutive_failures = 0
+        self._transition(BreakerState.CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a request that could not reach the envoy."""
+        self.consecutive_failures += 1
+        if (
+            self.state is BreakerState.HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            self._last_attempt = dt_util.utcnow().timestamp()
+            self._transition(BreakerState.OPEN)
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return breaker state and transition counts for diagnostics."""
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "transitions": dict(self.transitions),
+        }
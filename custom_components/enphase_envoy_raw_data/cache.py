@@ -0,0 +1,284 @@
+"""
+Response cache for Enphase Envoy Raw Data Support.
+
+This custom integration registers an enphase_envoy_raw_data integration
+that only provides a read_data(endpoint) and send_data(endpoint,data)
+action/service. No entities are provided.
+
+!!! SENDING DATA TO AN ENVOY ENDPOINT HAS RISK FOR PROPER OPERATION
+OF THE ENVOY. DOING SO IS AT YOUR OWN RISK AND SHOULD ONLY BE DONE
+FULLY UNDERSTANDING ANY EFFECT OF IT !!!
+
+This integration does not replace the core integration. It can be used next to it
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import orjson
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CACHE_STORAGE_VERSION,
+    CACHE_TTL,
+    DEFAULT_CACHE_TTL,
+    DEVICE_INDEX_KEYS,
+    DOMAIN,
+    NEGATIVE_CACHE_TTL,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.core import HomeAssistant
+
+
+@dataclass(slots=True)
+class EnvoyCacheEntry:
+    """Cached Envoy endpoint reply, the time it was fetched and its generation."""
+
+    data: Any
+    fetched: float
+    size: int = 0
+    generation: int = 0
+    # device records of list shaped replies by serial number or id
+    index: dict[str, dict[str, Any]] | None = None
+
+    def age(self, now: float | None = None) -> float:
+        """Return age of the cached reply in seconds."""
+        return (now or dt_util.utcnow().timestamp()) - self.fetched
+
+    def as_metadata(self, *, from_cache: bool, **extra: Any) -> dict[str, Any]:
+        """Return reply metadata for service responses."""
+        return {
+            "from_cache": from_cache,
+            "age": round(max(self.age(), 0.0), 3),
+            "fetched": dt_util.utc_from_timestamp(self.fetched).isoformat(),
+            "generation": self.generation,
+        } | extra
+
+
+def reply_size(data: Any) -> int:
+    """Return approximate size in bytes of an endpoint reply."""
+    if isinstance(data, str):
+        return len(data.encode())
+    try:
+        return len(orjson.dumps(data))
+    except TypeError:
+        return len(str(data).encode())
+
+
+def device_index(data: Any, key: str) -> dict[str, dict[str, Any]] | None:
+    """
+    Return device records in a list shaped reply by their key value.
+
+    Records in the list, or in the devices list of its items as in
+    inventory replies, are indexed. Returns None if the reply is not a list.
+    """
+    if not isinstance(data, list):
+        return None
+    index: dict[str, dict[str, Any]] = {}
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        if key in item:
+            index[str(item[key])] = item
+        elif isinstance(devices := item.get("devices"), list):
+            index.update(
+                (str(device[key]), device)
+                for device in devices
+                if isinstance(device, dict) and key in device
+            )
+    return index
+
+
+def cache_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return storage for the response cache of a config entry."""
+    return Store(
+        hass, CACHE_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.cache", private=True
+    )
+
+
+class EnvoyResponseCache:
+    """
+    Cache of Envoy endpoint replies.
+
+    Each reply is stored with its fetch time. A reply is only returned
+    when it is not older than the requested maximum age, which defaults
+    to the time to live configured for the endpoint.
+
+    The total size of cached replies is limited to max_size bytes, when
+    exceeded the least recently used replies are evicted.
+
+    Failed reads are remembered by http status for a short time, so
+    repeated reads of missing or unauthorized endpoints can fail fast.
+
+    Each store increments the cache generation. Replies stored together,
+    like the result of a full envoy update, share one generation so
+    readers can tell whether replies belong to the same data set.
+
+    Replies of list shaped endpoints in DEVICE_INDEX_KEYS are indexed by
+    device serial number or id when stored, so a single device record is
+    found without scanning the list.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize empty response cache limited to max_size bytes."""
+        self._entries: OrderedDict[str, EnvoyCacheEntry] = OrderedDict()
+        self._ttl: dict[str, float] = {}
+        # endpoint failure http status and time it expires
+        self._failures: dict[str, tuple[int, float]] = {}
+        self.max_size = max_size
+        self.size = 0
+        self.evictions = 0
+        self.generation = 0
+        # called when cached replies changed
+        self.listener: Callable[[], None] | None = None
+
+    def __contains__(self, endpoint: str) -> bool:
+        """Return True if endpoint has a cached reply, regardless of age."""
+        return endpoint in self._entries
+
+    def __len__(self) -> int:
+        """Return number of cached endpoints."""
+        return len(self._entries)
+
+    def ttl(self, endpoint: str) -> float:
+        """Return default time to live in seconds for endpoint."""
+        if (ttl := self._ttl.get(endpoint)) is not None:
+            return ttl
+        return CACHE_TTL.get(endpoint.split("?", 1)[0], DEFAULT_CACHE_TTL)
+
+    def set_ttl(self, endpoint: str, ttl: float | None) -> None:
+        """Override default time to live for endpoint, None to remove override."""
+        if ttl is None:
+            self._ttl.pop(endpoint, None)
+            return
+        self._ttl[endpoint] = ttl
+
+    def get(
+        self, endpoint: str, max_age: float | None = None
+    ) -> EnvoyCacheEntry | None:
+        """Return cached reply for endpoint if not older than max_age or ttl."""
+        if (entry := self._entries.get(endpoint)) is None:
+            return None
+        if max_age is None:
+            max_age = self.ttl(endpoint)
+        if entry.age() > max_age:
+            return None
+        self._entries.move_to_end(endpoint)
+        return entry
+
+    def set(
+        self,
+        endpoint: str,
+        data: Any,
+        fetched: float | None = None,
+        generation: int | None = None,
+    ) -> EnvoyCacheEntry:
+        """
+        Store reply for endpoint, fetched now if no fetch time specified.
+
+        Without generation specified the reply starts a new generation.
+        Returns the entry, which is not kept if larger than the cache size.
+        """
+        if generation is None:
+            self.generation += 1
+            generation = self.generation
+        key = DEVICE_INDEX_KEYS.get(endpoint.split("?", 1)[0])
+        entry = EnvoyCacheEntry(
+            data,
+            fetched or dt_util.utcnow().timestamp(),
+            reply_size(data),
+            generation,
+            device_index(data, key) if key else None,
+        )
+        self.pop(endpoint)
+        if entry.size > self.max_size:
+            return entry
+        self._entries[endpoint] = entry
+        self.size += entry.size
+        while self.size > self.max_size:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+            self.evictions += 1
+        if self.listener:
+            self.listener()
+        return entry
+
+    def pop(self, endpoint: str) -> EnvoyCacheEntry | None:
+        """Remove and return cached reply for endpoint."""
+        if (entry := self._entries.pop(endpoint, None)) is not None:
+            self.size -= entry.size
+        return entry
+
+    def update(self, replies: dict[str, Any]) -> int:
+        """
+        Store multiple endpoint replies fetched now as one generation.
+
+        The replies are copied from the passed dict, later changes to it
+        do not affect the cache. All replies are stored without yielding
+        to the event loop, so readers never see a partial update.
+        Returns the generation of the stored replies.
+        """
+        fetched = dt_util.utcnow().timestamp()
+        self.generation += 1
+        for endpoint, data in dict(replies).items():
+            self.set(endpoint, data, fetched, self.generation)
+        return self.generation
+
+    def clear(self) -> None:
+        """Remove all cached replies."""
+        self._entries.clear()
+        self.size = 0
+
+    def get_failure(self, endpoint: str) -> int | None:
+        """Return http status of a recent failed read of endpoint."""
+        if (failure := self._failures.get(endpoint)) is None:
+            return None
+        status, expires = failure
+        if dt_util.utcnow().timestamp() >= expires:
+            del self._failures[endpoint]
+            return None
+        return status
+
+    def set_failure(self, endpoint: str, status: int) -> None:
+        """Remember failed read of endpoint if its http status is cached."""
+        if (ttl := NEGATIVE_CACHE_TTL.get(status)) is None:
+            return
+        self._failures[endpoint] = (status, dt_util.utcnow().timestamp() + ttl)
+
+    def clear_failures(self) -> None:
+        """Forget all failed reads."""
+        self._failures.clear()
+
+    def as_storage(self) -> dict[str, Any]:
+        """Return cached replies in compact form, least recently used first."""
+        return {
+            "entries": [
+                [endpoint, entry.fetched, entry.generation, entry.data]
+                for endpoint, entry in self._entries.items()
+            ]
+        }
+
+    def restore(self, stored: dict[str, Any]) -> None:
+        """Restore cached replies from storage with their original fetch times."""
+        for endpoint, fetched, generation, data in stored.get("entries", []):
+            self.set(endpoint, data, fetched, generation)
+            self.generation = max(self.generation, generation)
+
+    @property
+    def occupancy(self) -> dict[str, Any]:
+        """Return cache occupancy for diagnostics."""
+        return {
+            "entries": len(self._entries),
+            "size": self.size,
+            "max_size": self.max_size,
+            "evictions": self.evictions,
+            "generation": self.generation,
+            "failures": len(self._failures),
+        }
@@ -22,6 +22,7 @@ from homeassistant.config_entries import (
     ConfigEntry,
     ConfigFlow,
     ConfigFlowResult,
+    OptionsFlow,
 )
 from homeassistant.const import (
     CONF_HOST,
@@ -32,15 +33,37 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.selector import ObjectSelector
 from homeassistant.util import dt as dt_util
 from pyenphase import Envoy, EnvoyError, EnvoyTokenAuth
 
 from .const import (
     ACCESS_TOKEN_LOGIN_URL,
+    CONF_CACHE_SIZE,
+    CONF_FULL_UPDATE,
+    CONF_HISTORY_SIZE,
     CONF_MANUAL_TOKEN,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_METER_STREAM,
+    CONF_RETRY_ATTEMPTS,
+    CONF_RETRY_BUDGET,
+    CONF_STREAM_BUCKET,
+    CONF_STREAM_INTERVAL,
+    CONF_WATCH_ENDPOINTS,
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_RETRY_ATTEMPTS,
+    DEFAULT_RETRY_BUDGET,
+    DEFAULT_STREAM_BUCKET,
+    DEFAULT_STREAM_INTERVAL,
     DOMAIN,
     ENVOY_NAME,
+    HISTORY_SIZE_LIMIT,
     INVALID_AUTH_ERRORS,
+    MAX_CONCURRENT_REQUESTS,
+    MAX_CONCURRENT_REQUESTS_LIMIT,
+    MAX_RETRY_ATTEMPTS,
+    MIN_WATCH_INTERVAL,
     UNIQUE_ID,
 )
 
@@ -61,6 +84,11 @@ AVOID_REFLECT_KEYS = {CONF_PASSWORD, CONF_TOKEN}
 
 UNKNOWN_TOKEN_TEXT = "?"
 
+# watched endpoints as endpoint: interval in seconds
+WATCH_ENDPOINTS_SCHEMA = vol.Schema(
+    {vol.Match(r"^/"): vol.All(vol.Coerce(int), vol.Range(min=MIN_WATCH_INTERVAL))}
+)
+
 
 def without_avoid_reflect_keys(dictionary: Mapping[str, Any]) -> dict[str, Any]:
     """Return a dictionary without AVOID_REFLECT_KEYS."""
@@ -123,6 +151,14 @@ class EnphaseExtConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: ConfigEntry,  # noqa: ARG004
+    ) -> EnphaseRawDataOptionsFlowHandler:
+        """Options flow handler for Enphase_Envoy_raw_data."""
+        return EnphaseRawDataOptionsFlowHandler()
+
     def __init__(self) -> None:
         """Initialize an envoy flow."""
         self.ip_address: str | None = None
@@ -378,3 +414,69 @@ class EnphaseExtConfigFlow(ConfigFlow, domain=DOMAIN):
             description_placeholders=description_placeholders,
             errors=errors,
         )
+
+
+class EnphaseRawDataOptionsFlowHandler(OptionsFlow):
+    """Envoy raw data config flow options handler."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            try:
+                user_input[CONF_WATCH_ENDPOINTS] = WATCH_ENDPOINTS_SCHEMA(
+                    user_input.get(CONF_WATCH_ENDPOINTS) or {}
+                )
+            except vol.Invalid:
+                errors[CONF_WATCH_ENDPOINTS] = "invalid_watch_endpoints"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                vol.Schema(
+                    {
+                        vol.Optional(
+                            CONF_WATCH_ENDPOINTS, default={}
+                        ): ObjectSelector(),
+                        vol.Optional(CONF_FULL_UPDATE, default=False): bool,
+                        vol.Optional(
+                            CONF_HISTORY_SIZE, default=DEFAULT_HISTORY_SIZE
+                        ): vol.All(
+                            vol.Coerce(int), vol.Range(min=0, max=HISTORY_SIZE_LIMIT)
+                        ),
+                        vol.Optional(
+                            CONF_CACHE_SIZE, default=DEFAULT_CACHE_SIZE
+                        ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                        vol.Optional(
+                            CONF_MAX_CONCURRENT_REQUESTS,
+                            default=MAX_CONCURRENT_REQUESTS,
+                        ): vol.All(
+                            vol.Coerce(int),
+                            vol.Range(min=1, max=MAX_CONCURRENT_REQUESTS_LIMIT),
+                        ),
+                        vol.Optional(
+                            CONF_RETRY_ATTEMPTS, default=DEFAULT_RETRY_ATTEMPTS
+                        ): vol.All(
+                            vol.Coerce(int), vol.Range(min=1, max=MAX_RETRY_ATTEMPTS)
+                        ),
+                        vol.Optional(
+                            CONF_RETRY_BUDGET, default=DEFAULT_RETRY_BUDGET
+                        ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                        vol.Optional(CONF_METER_STREAM, default=False): bool,
+                        vol.Optional(
+                            CONF_STREAM_INTERVAL, default=DEFAULT_STREAM_INTERVAL
+                        ): vol.All(vol.Coerce(float), vol.Range(min=1)),
+                        vol.Optional(
+                            CONF_STREAM_BUCKET, default=DEFAULT_STREAM_BUCKET
+                        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    }
+                ),
+                user_input or self.config_entry.options,
+            ),
+            description_placeholders={"min_interval": str(MIN_WATCH_INTERVAL)},
+            errors=errors,
+        )
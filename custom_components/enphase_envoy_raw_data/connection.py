@@ -0,0 +1,171 @@
+"""
+Connection pool for Enphase Envoy Raw Data Support.
+
+This custom integration registers an enphase_envoy_raw_data integration
+that only provides a read_data(endpoint) and send_data(endpoint,data)
+action/service. No entities are provided.
+
+!!! SENDING DATA TO AN ENVOY ENDPOINT HAS RISK FOR PROPER OPERATION
+OF THE ENVOY. DOING SO IS AT YOUR OWN RISK AND SHOULD ONLY BE DONE
+FULLY UNDERSTANDING ANY EFFECT OF IT !!!
+
+This integration does not replace the core integration. It can be used next to it
+"""
+
+from __future__ import annotations
+
+import socket
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+from aiohttp.abc import AbstractResolver, ResolveResult
+from aiohttp.hdrs import USER_AGENT
+from aiohttp_asyncmdnsresolver.api import AsyncDualMDNSResolver
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util import dt as dt_util
+from homeassistant.util.ssl import get_default_no_verify_context
+
+from .const import DNS_CACHE_TTL, KEEPALIVE_TIMEOUT
+
+if TYPE_CHECKING:
+    from zeroconf.asyncio import AsyncZeroconf
+
+
+class EnvoyResolver(AbstractResolver):
+    """
+    Resolver pinning connections to the resolved address of the envoy.
+
+    Resolving a hostname like envoy.local can take seconds, so the
+    result is used for all connections during ttl seconds. Aiohttp
+    does not resolve IP addresses. After a connection failure the
+    address is forgotten, so a changed envoy address is picked up by
+    the next request.
+
+    Like the Home Assistant client sessions, .local names are resolved
+    with mDNS through the Home Assistant zeroconf instance as well as
+    DNS, as many installs can not resolve them with DNS alone.
+    """
+
+    def __init__(
+        self, async_zeroconf: AsyncZeroconf, ttl: float = DNS_CACHE_TTL
+    ) -> None:
+        """Initialize resolver caching addresses for ttl seconds."""
+        self.ttl = ttl
+        self._resolver = AsyncDualMDNSResolver(async_zeroconf=async_zeroconf)
+        self._cache: dict[tuple[str, int, int], tuple[float, list[ResolveResult]]] = {}
+        self.lookups = 0
+        self.cache_hits = 0
+        self.invalidations = 0
+
+    async def resolve(
+        self, host: str, port: int = 0, family: socket.AddressFamily = socket.AF_INET
+    ) -> list[ResolveResult]:
+        """Return cached addresses for host or resolve them."""
+        key = (host, port, family)
+        now = dt_util.utcnow().timestamp()
+        if (cached := self._cache.get(key)) and now - cached[0] < self.ttl:
+            self.cache_hits += 1
+            return cached[1]
+        self.lookups += 1
+        addresses = await self._resolver.resolve(host, port, family)
+        self._cache[key] = (now, addresses)
+        return addresses
+
+    def invalidate(self) -> None:
+        """Forget resolved addresses, resolve again for the next connection."""
+        if self._cache:
+            self.invalidations += 1
+            self._cache.clear()
+
+    async def close(self) -> None:
+        """Close the resolver."""
+        await self._resolver.close()
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return pinned addresses and resolve statistics."""
+        return {
+            "pinned": sorted(
+                {
+                    address["host"]
+                    for _, addresses in self._cache.values()
+                    for address in addresses
+                }
+            ),
+            "lookups": self.lookups,
+            "cache_hits": self.cache_hits,
+            "invalidations": self.invalidations,
+        }
+
+
+class EnvoyConnectionPool:
+    """
+    Client session with a dedicated connection pool for one envoy.
+
+    Each new HTTPS connection costs the envoy a TLS handshake, so idle
+    connections are kept open for reuse, shorter than the envoy web
+    server keeps them open. The number of connections is limited to
+    the number of concurrent requests. New and reused connections are
+    counted for diagnostics. Hostnames are resolved by the
+    EnvoyResolver instead of the connector DNS cache.
+    """
+
+    def __init__(self, limit: int, async_zeroconf: AsyncZeroconf) -> None:
+        """Initialize session allowing limit connections to the envoy."""
+        self.limit = limit
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.queued = 0
+        self.resolver = EnvoyResolver(async_zeroconf)
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_create)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuse)
+        trace_config.on_connection_queued_start.append(self._on_connection_queued)
+        self.connector = aiohttp.TCPConnector(
+            ssl=get_default_no_verify_context(),
+            limit=limit,
+            limit_per_host=limit,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            resolver=self.resolver,
+            use_dns_cache=False,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=self.connector,
+            headers={USER_AGENT: SERVER_SOFTWARE},
+            json_serialize=json_dumps,
+            trace_configs=[trace_config],
+        )
+
+    async def _on_connection_create(self, *_: Any) -> None:
+        """Count new connection to the envoy."""
+        self.connections_created += 1
+
+    async def _on_connection_reuse(self, *_: Any) -> None:
+        """Count request reusing an idle connection to the envoy."""
+        self.connections_reused += 1
+
+    async def _on_connection_queued(self, *_: Any) -> None:
+        """Count request waiting for a free connection."""
+        self.queued += 1
+
+    async def async_close(self, *_: Any) -> None:
+        """Close the session and all its connections."""
+        await self.session.close()
+        await self.resolver.close()
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return connection pool settings and reuse statistics."""
+        connections = self.connections_created + self.connections_reused
+        return {
+            "limit": self.limit,
+            "keepalive_timeout": KEEPALIVE_TIMEOUT,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": round(self.connections_reused / connections, 3)
+            if connections
+            else 0.0,
+            "queued": self.queued,
+            "dns": self.resolver.diagnostics,
+        }
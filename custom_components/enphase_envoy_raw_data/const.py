@@ -19,6 +19,16 @@ DOMAIN = "enphase_envoy_raw_data"
 CONF_UPDATER = "updater"
 ACCESS_TOKEN_LOGIN_URL = "https://entrez.enphaseenergy.com"
 CONF_MANUAL_TOKEN = "use_manual_token"
+CONF_WATCH_ENDPOINTS = "watch_endpoints"
+CONF_FULL_UPDATE = "full_update"
+CONF_CACHE_SIZE = "cache_size"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_RETRY_ATTEMPTS = "retry_attempts"
+CONF_RETRY_BUDGET = "retry_budget"
+CONF_METER_STREAM = "meter_stream"
+CONF_STREAM_INTERVAL = "stream_interval"
+CONF_STREAM_BUCKET = "stream_bucket"
+CONF_HISTORY_SIZE = "history_size"
 
 NAME = "Enphase Envoy Raw Data"
 
@@ -27,3 +37,108 @@ ENVOY_NAME = "Envoy-raw-data"
 UNIQUE_ID = f"{DOMAIN}_for_"
 
 INVALID_AUTH_ERRORS = (EnvoyAuthenticationError, EnvoyAuthenticationRequired)
+
+# Small authenticated endpoint read to verify communication with the Envoy
+PROBE_ENDPOINT = "/api/v1/production"
+
+# Default and upper limit of concurrent requests to a single Envoy,
+# its web server degrades with more
+MAX_CONCURRENT_REQUESTS = 2
+MAX_CONCURRENT_REQUESTS_LIMIT = 8
+
+# Seconds to keep an idle connection to the Envoy open for reuse, below the
+# idle timeout of the Envoy web server to avoid reusing closed connections
+KEEPALIVE_TIMEOUT = 10
+
+# Seconds to use the resolved address of an Envoy configured by hostname,
+# resolved again sooner when connecting to it fails
+DNS_CACHE_TTL = 300
+
+# Default kilobytes of endpoint replies kept in the cache of a config entry
+DEFAULT_CACHE_SIZE = 1024
+
+# Storage of the cache to keep it across restarts, saved at most once per delay
+CACHE_STORAGE_VERSION = 1
+CACHE_SAVE_DELAY = 60
+
+# Seconds a cached endpoint reply is considered fresh if not specified for endpoint
+DEFAULT_CACHE_TTL = 60
+
+# Endpoint specific seconds a cached reply is considered fresh, query string excluded
+CACHE_TTL: dict[str, int] = {
+    "/info": 3600,
+    "/home": 300,
+    "/admin/lib/tariff": 3600,
+    "/api/v1/production": 60,
+    # micro-inverters report once every 5 minutes
+    "/api/v1/production/inverters": 300,
+    "/inventory.json": 300,
+    "/ivp/ensemble/inventory": 300,
+    "/ivp/meters": 3600,
+    "/ivp/meters/readings": 5,
+    "/ivp/ss/dry_contact_settings": 3600,
+    "/production.json": 60,
+}
+
+# List shaped endpoint replies indexed by device, with the key identifying the
+# device in each record. Inventory replies list the devices per device type.
+DEVICE_INDEX_KEYS: dict[str, str] = {
+    "/api/v1/production/inverters": "serialNumber",
+    "/inventory.json": "serial_num",
+    "/ivp/ensemble/inventory": "serial_num",
+    "/ivp/meters": "eid",
+    "/ivp/meters/readings": "eid",
+}
+
+# Consecutive connection failures after which requests to the Envoy are paused,
+# and seconds between requests probing if the Envoy is reachable again
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT = 30
+
+# Attempts for reads failing on connection errors or timeouts, with a random
+# wait before each retry up to a delay doubling from base to max seconds.
+# Retries of all reads together are limited to a budget per window of seconds.
+DEFAULT_RETRY_ATTEMPTS = 3
+MAX_RETRY_ATTEMPTS = 6
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 10
+DEFAULT_RETRY_BUDGET = 10
+RETRY_BUDGET_WINDOW = 60
+
+# Streaming meter readings, about 1 per second, forwarded at most every
+# interval seconds as event and cached reply of the stream endpoint
+STREAM_ENDPOINT = "/stream/meter"
+EVENT_METER_STREAM = f"{DOMAIN}_meter_stream"
+DEFAULT_STREAM_INTERVAL = 5
+# Seconds of readings to aggregate into 1 event, 0 to forward readings
+DEFAULT_STREAM_BUCKET = 0
+# Seconds without readings after which the stream is considered broken
+STREAM_READ_TIMEOUT = 30
+# Reconnect a broken stream after a random wait up to a delay doubling
+# from base to max seconds
+STREAM_RECONNECT_BASE_DELAY = 1
+STREAM_RECONNECT_MAX_DELAY = 300
+
+# Number of replies of each watched endpoint to keep numeric values of,
+# and upper limits for it and for the number of values per endpoint
+DEFAULT_HISTORY_SIZE = 360
+HISTORY_SIZE_LIMIT = 8640
+HISTORY_MAX_SERIES = 500
+
+# Seconds without inverter report after which analyze_inverters reports an
+# inverter as stale, micro-inverters report once every 5 minutes, and number
+# of standard deviations below mean power to report it as underperforming
+DEFAULT_STALE_REPORT_AGE = 900
+DEFAULT_UNDERPERFORMING_ZSCORE = 2.0
+
+# Seconds a failed endpoint read fails without sending a request, per http status
+NEGATIVE_CACHE_TTL: dict[int, int] = {
+    # endpoint requires installer rights
+    401: 60,
+    403: 60,
+    # endpoint not available in this firmware
+    404: 300,
+}
+
+# Minimum seconds between background polls of a watched endpoint
+MIN_WATCH_INTERVAL = 5
@@ -14,25 +14,66 @@ This integration does not replace the core integration. It can be used next to i
 
 from __future__ import annotations
 
+import asyncio
 import contextlib
 import datetime
 import logging
+import time
+from dataclasses import dataclass
 from datetime import timedelta
-from typing import Any
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
 
+import orjson
+from aiohttp import ClientError, ClientResponse
 from homeassistant.components import persistent_notification
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_NAME, CONF_PASSWORD, CONF_TOKEN, CONF_USERNAME
 from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
-from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
-from pyenphase import Envoy, EnvoyError, EnvoyTokenAuth
-
-from .const import CONF_MANUAL_TOKEN, DOMAIN, ENVOY_NAME, INVALID_AUTH_ERRORS
+from pyenphase import (
+    Envoy,
+    EnvoyAuthenticationRequired,
+    EnvoyError,
+    EnvoyHTTPStatusError,
+    EnvoyTokenAuth,
+)
+
+from .breaker import BreakerState, EnvoyCircuitBreaker, EnvoyUnavailableError
+from .cache import EnvoyCacheEntry, EnvoyResponseCache, cache_store
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    CACHE_SAVE_DELAY,
+    CONF_CACHE_SIZE,
+    CONF_MANUAL_TOKEN,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_RETRY_ATTEMPTS,
+    CONF_RETRY_BUDGET,
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_RETRY_ATTEMPTS,
+    DEFAULT_RETRY_BUDGET,
+    DOMAIN,
+    ENVOY_NAME,
+    INVALID_AUTH_ERRORS,
+    MAX_CONCURRENT_REQUESTS,
+    PROBE_ENDPOINT,
+    STREAM_ENDPOINT,
+)
+from .history import EndpointHistory
+from .retry import EnvoyRetryPolicy
+from .scheduler import EnvoyRequestScheduler, RequestPriority
+from .stream import EnvoyMeterStream
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
+
+    from .connection import EnvoyConnectionPool
 
 SCAN_INTERVAL = timedelta(seconds=60)
 
@@ -40,6 +81,8 @@ TOKEN_REFRESH_CHECK_INTERVAL = timedelta(days=1)
 STALE_TOKEN_THRESHOLD = 30  # days
 NOTIFICATION_ID = f"{DOMAIN}_notification"
 FIRMWARE_REFRESH_INTERVAL = timedelta(hours=4)
+# watched endpoints stay fresh in cache until the next poll has completed
+WATCH_TTL_FACTOR = 1.5
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,6 +90,27 @@ _LOGGER = logging.getLogger(__name__)
 type EnphaseRawDataConfigEntry = ConfigEntry[EnphaseRawDataUpdateCoordinator]
 
 
+async def _decode_reply(response: ClientResponse) -> Any:
+    """Return JSON reply as dict or list, other replies as text."""
+    try:
+        return orjson.loads(await response.read())
+    except orjson.JSONDecodeError, ValueError:
+        # it's xml or html
+        _LOGGER.debug("envoy_request, No JSON data returned, decode it")
+        return await response.text()
+
+
+@dataclass(slots=True)
+class InFlightRequest:
+    """Pending envoy request shared by all callers for the same key."""
+
+    task: asyncio.Task[Any]
+    callers: int = 1
+    waiting: int = 1
+    # highest priority of the callers, for requests sent through the scheduler
+    priority: RequestPriority | None = None
+
+
 class EnphaseRawDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """
     DataUpdateCoordinator to gather data from any envoy.
@@ -63,10 +127,15 @@ class EnphaseRawDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     config_entry: EnphaseRawDataConfigEntry
 
     def __init__(
-        self, hass: HomeAssistant, envoy: Envoy, entry: EnphaseRawDataConfigEntry
+        self,
+        hass: HomeAssistant,
+        envoy: Envoy,
+        entry: EnphaseRawDataConfigEntry,
+        pool: EnvoyConnectionPool,
     ) -> None:
         """Initialize DataUpdateCoordinator for the envoy raw data."""
         self.envoy = envoy
+        self.pool = pool
         entry_data = entry.data
         self.username = entry_data.get(CONF_USERNAME)
         self.password = entry_data.get(CONF_PASSWORD)
@@ -75,7 +144,29 @@ class EnphaseRawDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self.envoy_firmware = ""
         self._cancel_token_refresh: CALLBACK_TYPE | None = None
         self._cancel_firmware_refresh: CALLBACK_TYPE | None = None
+        self._cancel_watch: list[CALLBACK_TYPE] = []
+        self.meter_stream: EnvoyMeterStream | None = None
+        self.history: dict[str, EndpointHistory] = {}
         self.token_lifetime = 0
+        self.cache = EnvoyResponseCache(
+            entry.options.get(CONF_CACHE_SIZE, DEFAULT_CACHE_SIZE) * 1024
+        )
+        self._cache_store = cache_store(hass, entry.entry_id)
+        self._cache_save_pending = False
+        self._in_flight: dict[str, InFlightRequest] = {}
+        # incremented on each successful re-authentication
+        self._auth_generation = 0
+        self.breaker = EnvoyCircuitBreaker(
+            entry.title, BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT
+        )
+        self.retry_policy = EnvoyRetryPolicy(
+            entry.options.get(CONF_RETRY_ATTEMPTS, DEFAULT_RETRY_ATTEMPTS),
+            entry.options.get(CONF_RETRY_BUDGET, DEFAULT_RETRY_BUDGET),
+        )
+        # limit and order concurrent requests send to the envoy by services
+        self.scheduler = EnvoyRequestScheduler(
+            entry.options.get(CONF_MAX_CONCURRENT_REQUESTS, MAX_CONCURRENT_REQUESTS)
+        )
         super().__init__(
             hass,
             _LOGGER,
@@ -171,6 +262,8 @@ class EnphaseRawDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 new_firmware,
                 self.name,
             )
+            # endpoint availability may have changed with the firmware
+            self.cache.clear_failures()
             # reload the integration to get all established again
             self.hass.async_create_task(
                 self.hass.config_entries.async_reload(self.config_entry.entry_id)
@@ -256,15 +349,28 @@ class EnphaseRawDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         )
 
     async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch all device and sensor data from api."""
+        """Set up and authenticate if needed and verify with a probe request."""
         envoy = self.envoy
         for tries in range(2):
             try:
                 if not self._setup_complete:
                     await self._async_setup_and_authenticate()
                     self._async_mark_setup_complete()
-                # dump all received data in debug mode to assist troubleshooting
-                envoy_data = await envoy.update()
+                # one small authenticated request proves communication is established
+                response = await envoy.request(PROBE_ENDPOINT)
+                if response.status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+                    raise EnvoyHTTPStatusError(response.status, PROBE_ENDPOINT)
+                # any other reply proves the envoy is reachable and accepted the
+                # credentials, some envoys do not serve the probe endpoint
+                probe_reply = (
+                    await _decode_reply(response)
+                    if 200 <= response.status < 300  # noqa: PLR2004
+                    else None
+                )
+            except ClientError, TimeoutError:
+                self.breaker.record_failure()
+                self.pool.resolver.invalidate()
+                raise
             except INVALID_AUTH_ERRORS as err:
                 if self._setup_complete and tries == 0:
                     # token likely expired or firmware changed, try to re-authenticate
@@ -288,34 +394,467 @@ class EnphaseRawDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                     },
                 ) from err
 
-            # if we have a firmware version from previous setup, compare to current one
-            # when envoy gets new firmware there will be an authentication failure
-            # which results in getting fw version again, if so reload the integration.
-            if (current_firmware := self.envoy_firmware) and current_firmware != (
-                new_firmware := envoy.firmware
-            ):
-                _LOGGER.warning(
-                    "Envoy firmware changed from: %s to: %s, reloading enphase envoy raw data integration",  # noqa: E501
-                    current_firmware,
-                    new_firmware,
-                )
-                # reload the integration to get all established again
-                self.hass.async_create_task(
-                    self.hass.config_entries.async_reload(self.config_entry.entry_id)
-                )
-            # remember firmware version for next time
-            self.envoy_firmware = envoy.firmware
-            _LOGGER.debug("Envoy data: %s", envoy_data)
-            return envoy_data.raw
+            # probe at setup or reload reached the envoy, close the breaker.
+            # There are no periodic updates, after setup the breaker only
+            # closes when a half open service request reaches the envoy.
+            self.breaker.record_success()
+            self._async_check_firmware_change()
+            _LOGGER.debug("Envoy probe status %s: %s", response.status, probe_reply)
+            if probe_reply is not None:
+                self.cache.set(PROBE_ENDPOINT, probe_reply)
+            return {PROBE_ENDPOINT: probe_reply}
 
         raise RuntimeError(  # noqa: TRY003
             "Unreachable code in _async_update_data"  # noqa: EM101
         )  # pragma: no cover
 
+    async def async_load_cache(self) -> None:
+        """Restore cached replies saved before restart and save future changes."""
+        if stored := await self._cache_store.async_load():
+            self.cache.restore(stored)
+        self.cache.listener = self._async_schedule_cache_save
+
+    @callback
+    def _async_schedule_cache_save(self) -> None:
+        """
+        Save the cache after a delay, combining all changes within the delay.
+
+        The store restarts its delay on each call, so a save is only
+        scheduled when none is pending. Otherwise frequent changes, like
+        a fast watched endpoint or the meter stream, postpone it forever.
+        """
+        if self._cache_save_pending:
+            return
+        self._cache_save_pending = True
+        self._cache_store.async_delay_save(self._cache_data_to_save, CACHE_SAVE_DELAY)
+
+    @callback
+    def _cache_data_to_save(self) -> dict[str, Any]:
+        """Return cache to save and allow scheduling the next save."""
+        self._cache_save_pending = False
+        return self.cache.as_storage()
+
+    async def async_save_cache(self) -> None:
+        """Save the cache now, replacing a pending delayed save."""
+        await self._cache_store.async_save(self._cache_data_to_save())
+
+    async def async_update_all(self) -> None:
+        """Collect all pyenphase data and cache all endpoints read for it."""
+        try:
+            envoy_data = await self.envoy.update()
+        except (EnvoyError, ClientError, TimeoutError) as err:
+            # data is only used to pre-fill the cache, no need to retry
+            _LOGGER.debug("%s: Error collecting all envoy data: %s", self.name, err)
+            return
+        # dump all received data in debug mode to assist troubleshooting
+        _LOGGER.debug("Envoy data: %s", envoy_data)
+        # endpoints read by pyenphase are available for read_data from cache
+        self.cache.update(envoy_data.raw)
+
+    @callback
+    def _async_check_firmware_change(self) -> None:
+        """Reload the integration if envoy firmware changed since last setup."""
+        # if we have a firmware version from previous setup, compare to current one
+        # when envoy gets new firmware there will be an authentication failure
+        # which results in getting fw version again, if so reload the integration.
+        if (current_firmware := self.envoy_firmware) and current_firmware != (
+            new_firmware := self.envoy.firmware
+        ):
+            _LOGGER.warning(
+                "Envoy firmware changed from: %s to: %s, reloading enphase envoy raw data integration",  # noqa: E501
+                current_firmware,
+                new_firmware,
+            )
+            # endpoint availability may have changed with the firmware
+            self.cache.clear_failures()
+            # reload the integration to get all established again
+            self.hass.async_create_task(
+                self.hass.config_entries.async_reload(self.config_entry.entry_id)
+            )
+        # remember firmware version for next time
+        self.envoy_firmware = self.envoy.firmware
+
     async def try_reauthenticate(self) -> None:
-        """Try re-authentication when only using requests and 401 is returned."""
+        """
+        Try re-authentication when only using requests and 401 is returned.
+
+        Only envoy setup and authentication are performed, the caller
+        retries its original request. Errors are raised to the caller.
+        """
         self._setup_complete = False
-        await self._async_update_data()
+        await self._async_setup_and_authenticate()
+        self._async_mark_setup_complete()
+        self._async_check_firmware_change()
+
+    async def async_reauthenticate(self, generation: int) -> None:
+        """
+        Re-authenticate once for all requests failing on the same credentials.
+
+        Concurrent callers share one re-authentication. A caller whose
+        request was sent before the last re-authentication completed
+        returns right away and can retry with the new credentials.
+        """
+        if generation != self._auth_generation:
+            return
+
+        async def _reauthenticate() -> None:
+            await self.try_reauthenticate()
+            self._auth_generation += 1
+
+        await self.async_single_flight("reauthenticate", _reauthenticate)
+
+    async def async_request(
+        self,
+        endpoint: str,
+        data: dict[str, Any] | None = None,
+        method: str | None = None,
+        priority: RequestPriority | None = None,
+    ) -> Any:
+        """
+        Send request to the envoy and return the decoded reply.
+
+        Reads are retried on connection errors and timeouts as allowed
+        by the retry policy, data sent to the envoy is never retried.
+        """
+        reply, _ = await self._async_request_retry(endpoint, data, method, priority)
+        return reply
+
+    async def _async_request_retry(
+        self,
+        endpoint: str,
+        data: dict[str, Any] | None = None,
+        method: str | None = None,
+        priority: RequestPriority | None = None,
+        key: str | None = None,
+    ) -> tuple[Any, int]:
+        """
+        Send request to the envoy, return decoded reply and number of retries.
+
+        A request counts as 1 circuit breaker failure when it failed after
+        all retries. A request probing a half open breaker is not retried.
+        A request shared by callers under key is sent with the highest
+        priority of its callers.
+        """
+        attempt = 1
+        while True:
+            if (
+                key
+                and (in_flight := self._in_flight.get(key))
+                and (in_flight.priority is not None)
+            ):
+                priority = in_flight.priority
+            try:
+                reply = await self._async_send(endpoint, data, method, priority, key)
+            except (ClientError, TimeoutError) as err:
+                if (
+                    data is not None
+                    or self.breaker.state is not BreakerState.CLOSED
+                    or not self.retry_policy.acquire(attempt)
+                ):
+                    self.breaker.record_failure()
+                    raise
+                delay = self.retry_policy.delay(attempt)
+                _LOGGER.debug(
+                    "envoy_request, %s attempt %s failed, retry in %.1fs: %s",
+                    endpoint,
+                    attempt,
+                    delay,
+                    err,
+                )
+                # wait outside the scheduler so other requests can use the slot
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            return reply, attempt - 1
+
+    async def _async_send(
+        self,
+        endpoint: str,
+        data: dict[str, Any] | None = None,
+        method: str | None = None,
+        priority: RequestPriority | None = None,
+        key: str | None = None,
+    ) -> Any:
+        """
+        Send request to the envoy once and return the decoded reply.
+
+        Requests wait for the scheduler in order of priority, which
+        defaults to read for requests without data and send otherwise.
+        The priority of a request waiting under key can be raised.
+
+        Re-authenticates and retries once if the envoy requires
+        authentication. Replies that are not JSON are returned as text.
+        Reads of endpoints that recently failed as not found or not
+        authorized fail right away without a request to the envoy.
+
+        :raises EnvoyHTTPStatusError: if reply status is not in 200 range
+        """
+        envoy = self.envoy
+        read = data is None
+        if read and (status := self.cache.get_failure(endpoint)):
+            _LOGGER.debug("envoy_request, %s recently failed: %s", endpoint, status)
+            if status in (HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN):
+                msg = f"Authentication failed for {endpoint} with status {status}"
+                raise EnvoyAuthenticationRequired(msg)
+            raise EnvoyHTTPStatusError(status, endpoint)
+
+        if not self.breaker.allow():
+            failures = self.breaker.consecutive_failures
+            msg = f"{failures} consecutive connection failures"
+            raise EnvoyUnavailableError(msg)
+
+        if priority is None:
+            priority = RequestPriority.READ if read else RequestPriority.SEND
+        async with self.scheduler.slot(priority, key):
+            # handle auth changes due to envoy restart or token expiry
+            for tries in range(2):
+                generation = self._auth_generation
+                start = time.monotonic()
+                try:
+                    _LOGGER.debug("envoy_request, sending request to %s", endpoint)
+                    response: ClientResponse = await envoy.request(
+                        endpoint, data, method
+                    )
+                except ClientError, TimeoutError:
+                    # envoy likely overloaded or not reachable
+                    self.scheduler.record(
+                        endpoint, time.monotonic() - start, failed=True
+                    )
+                    # envoy may have a new address
+                    self.pool.resolver.invalidate()
+                    raise
+                except INVALID_AUTH_ERRORS:
+                    if tries == 0:
+                        # token likely expired or firmware changed, re-authenticate
+                        await self.async_reauthenticate(generation)
+                        continue
+                    if read:
+                        # still not authorized, likely needs installer rights
+                        self.cache.set_failure(endpoint, HTTPStatus.UNAUTHORIZED)
+                    raise
+                break
+
+            self.breaker.record_success()
+            self.scheduler.record(
+                endpoint,
+                time.monotonic() - start,
+                failed=response.status >= HTTPStatus.INTERNAL_SERVER_ERROR,
+            )
+            if not (200 <= response.status < 300):  # noqa: PLR2004
+                if read:
+                    self.cache.set_failure(endpoint, response.status)
+                raise EnvoyHTTPStatusError(response.status, endpoint)
+            _LOGGER.debug("envoy_request, request status %s", response.status)
+            return await _decode_reply(response)
+
+    async def async_read(
+        self, endpoint: str, priority: RequestPriority = RequestPriority.READ
+    ) -> tuple[EnvoyCacheEntry, int, int]:
+        """
+        Read endpoint from the envoy and store the reply in the cache.
+
+        Concurrent reads of the same endpoint share one request, sent
+        with the highest priority of its callers. Returns the cache entry,
+        the number of callers that shared the request and the number of
+        retries needed.
+        """
+
+        async def _fetch() -> tuple[EnvoyCacheEntry, int]:
+            reply, retries = await self._async_request_retry(
+                endpoint, priority=priority, key=endpoint
+            )
+            entry = self.cache.set(endpoint, reply)
+            if history := self.history.get(endpoint):
+                history.record(entry.data, entry.fetched)
+            return entry, retries
+
+        (entry, retries), callers = await self.async_single_flight(
+            endpoint, _fetch, priority
+        )
+        return entry, callers, retries
+
+    async def async_single_flight[T](
+        self,
+        key: str,
+        request: Callable[[], Coroutine[Any, Any, T]],
+        priority: RequestPriority | None = None,
+    ) -> tuple[T, int]:
+        """
+        Run request once for all concurrent callers using the same key.
+
+        Callers arriving while a request for the key is pending await
+        the result of that request instead of starting a new one. The
+        request is cancelled when all waiting callers are cancelled.
+        A caller with a higher priority moves a request still waiting in
+        the scheduler up to its priority. Returns the result and the
+        number of callers that shared it.
+        """
+        if (in_flight := self._in_flight.get(key)) is None:
+            task = self.hass.async_create_task(
+                request(), f"{self.name} request {key}", eager_start=False
+            )
+            in_flight = self._in_flight[key] = InFlightRequest(task, priority=priority)
+
+            @callback
+            def _async_request_done(_: asyncio.Task[Any]) -> None:
+                if (pending := self._in_flight.get(key)) and pending.task is task:
+                    del self._in_flight[key]
+
+            task.add_done_callback(_async_request_done)
+        else:
+            in_flight.callers += 1
+            in_flight.waiting += 1
+            if priority is not None and (
+                in_flight.priority is None or priority < in_flight.priority
+            ):
+                in_flight.priority = priority
+                self.scheduler.raise_priority(key, priority)
+            _LOGGER.debug(
+                "%s: joining pending request %s, %s callers",
+                self.name,
+                key,
+                in_flight.callers,
+            )
+        # shield so a cancelled caller does not cancel the request for the others
+        try:
+            result = await asyncio.shield(in_flight.task)
+        except asyncio.CancelledError:
+            in_flight.waiting -= 1
+            if not in_flight.waiting and not in_flight.task.done():
+                # nobody waits for the reply anymore, stop the envoy request
+                _LOGGER.debug("%s: cancelling request %s", self.name, key)
+                in_flight.task.cancel()
+                if self._in_flight.get(key) is in_flight:
+                    del self._in_flight[key]
+            raise
+        return result, in_flight.callers
+
+    @callback
+    def async_start_watch(self, watch: dict[str, float], history_size: int = 0) -> None:
+        """
+        Start background polls of watched endpoints to keep them in the cache.
+
+        Each endpoint is polled at its own interval in seconds. First polls
+        are spread over the intervals to avoid bursts of requests. Watched
+        endpoints use their interval as cache time, so cached reads of them
+        will not cause requests to the envoy. Numeric values of the last
+        history_size replies of each watched endpoint are kept in history.
+        """
+        self.async_cancel_watch()
+        if STREAM_ENDPOINT in watch:
+            _LOGGER.warning(
+                "%s: %s can not be watched, enable stream meter readings instead",
+                self.name,
+                STREAM_ENDPOINT,
+            )
+            watch = {
+                endpoint: interval
+                for endpoint, interval in watch.items()
+                if endpoint != STREAM_ENDPOINT
+            }
+        self.history = (
+            {endpoint: EndpointHistory(history_size) for endpoint in watch}
+            if history_size
+            else {}
+        )
+        for index, (endpoint, interval) in enumerate(watch.items()):
+            self.cache.set_ttl(
+                endpoint, max(self.cache.ttl(endpoint), interval * WATCH_TTL_FACTOR)
+            )
+            self._cancel_watch.append(
+                async_call_later(
+                    self.hass,
+                    interval * index / len(watch),
+                    self._async_watch_starter(endpoint, interval),
+                )
+            )
+        _LOGGER.debug("%s: watching endpoints %s", self.name, watch)
+
+    def _async_watch_starter(
+        self, endpoint: str, interval: float
+    ) -> Callable[[datetime.datetime], None]:
+        """Return callback starting the periodic poll of a watched endpoint."""
+
+        @callback
+        def _async_poll(now: datetime.datetime) -> None:
+            # a recent read by a service makes this poll unneeded
+            if self.cache.get(endpoint, interval / 2):
+                return
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self._async_read_background(endpoint),
+                f"{self.name} watch {endpoint}",
+            )
+
+        @callback
+        def _async_start(now: datetime.datetime) -> None:
+            self._cancel_watch.append(
+                async_track_time_interval(
+                    self.hass,
+                    _async_poll,
+                    timedelta(seconds=interval),
+                    cancel_on_shutdown=True,
+                )
+            )
+            _async_poll(now)
+
+        return _async_start
+
+    @callback
+    def async_start_stream(self, interval: float, bucket: float = 0) -> None:
+        """
+        Start receiving meter readings from the stream endpoint.
+
+        Readings are forwarded every interval seconds or, with a bucket
+        size in seconds, aggregated into bucket summaries.
+        """
+        self.async_stop_stream()
+        self.cache.set_ttl(
+            STREAM_ENDPOINT,
+            max(
+                self.cache.ttl(STREAM_ENDPOINT),
+                (bucket or interval) * WATCH_TTL_FACTOR,
+            ),
+        )
+        self.meter_stream = EnvoyMeterStream(self, interval, bucket)
+        self.meter_stream.async_start()
+
+    @callback
+    def async_stop_stream(self) -> None:
+        """Stop receiving meter readings."""
+        if self.meter_stream:
+            self.meter_stream.async_stop()
+
+    @property
+    def auth_generation(self) -> int:
+        """Return number of re-authentications, to pass to async_reauthenticate."""
+        return self._auth_generation
+
+    @callback
+    def async_revalidate(self, endpoint: str) -> None:
+        """Refresh cached reply of endpoint in the background."""
+        if endpoint in self._in_flight:
+            # pending read will refresh the cache
+            return
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_read_background(endpoint),
+            f"{self.name} revalidate {endpoint}",
+        )
+
+    async def _async_read_background(self, endpoint: str) -> None:
+        """Read endpoint into the cache at low priority, errors are only logged."""
+        try:
+            await self.async_read(endpoint, RequestPriority.BACKGROUND)
+        except (EnvoyError, ClientError, TimeoutError, HomeAssistantError) as err:
+            # just try again next time
+            _LOGGER.debug("%s: Error reading %s: %s", self.name, endpoint, err)
+
+    @callback
+    def async_cancel_watch(self) -> None:
+        """Cancel background polls of watched endpoints."""
+        while self._cancel_watch:
+            self._cancel_watch.pop()()
 
     @callback
     def async_cancel_token_refresh(self) -> None:
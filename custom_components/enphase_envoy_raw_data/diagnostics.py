@@ -26,9 +26,10 @@ from homeassistant.const import (
 )
 
 if TYPE_CHECKING:
-    from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
 
+    from .coordinator import EnphaseRawDataConfigEntry
+
 TO_REDACT = {
     CONF_NAME,
     CONF_PASSWORD,
@@ -42,11 +43,24 @@ TO_REDACT = {
 
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant,
-    entry: ConfigEntry,
+    entry: EnphaseRawDataConfigEntry,
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
+    coordinator = entry.runtime_data
     diagnostic_data: dict[str, Any] = {
         "config_entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "cache": coordinator.cache.occupancy,
+        "scheduler": coordinator.scheduler.occupancy,
+        "breaker": coordinator.breaker.diagnostics,
+        "retry": coordinator.retry_policy.diagnostics,
+        "history": {
+            endpoint: history.diagnostics
+            for endpoint, history in coordinator.history.items()
+        },
+        "connections": coordinator.pool.diagnostics,
+        "meter_stream": coordinator.meter_stream.diagnostics
+        if coordinator.meter_stream
+        else None,
     }
 
     return diagnostic_data
@@ -0,0 +1,124 @@
+"""
+Endpoint history for Enphase Envoy Raw Data Support.
+
+This custom integration registers an enphase_envoy_raw_data integration
+that only provides a read_data(endpoint) and send_data(endpoint,data)
+action/service. No entities are provided.
+
+!!! SENDING DATA TO AN ENVOY ENDPOINT HAS RISK FOR PROPER OPERATION
+OF THE ENVOY. DOING SO IS AT YOUR OWN RISK AND SHOULD ONLY BE DONE
+FULLY UNDERSTANDING ANY EFFECT OF IT !!!
+
+This integration does not replace the core integration. It can be used next to it
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from fnmatch import fnmatchcase
+from typing import Any
+
+from .const import HISTORY_MAX_SERIES
+
+# list items with one of these keys are identified by it instead of position
+ITEM_KEYS = ("serialNumber", "serial_num", "eid")
+
+
+def _item_key(index: int, item: Any) -> str:
+    """Return key of a list item, its serial number or id if it has one."""
+    if isinstance(item, dict):
+        for key in ITEM_KEYS:
+            if key in item:
+                return str(item[key])
+    return str(index)
+
+
+def numeric_values(data: Any, path: str = "") -> list[tuple[str, float]]:
+    """Return dotted path and value of all numbers in an endpoint reply."""
+    if isinstance(data, bool):
+        return []
+    if isinstance(data, int | float):
+        return [(path, data)]
+    if isinstance(data, dict):
+        items = [(str(key), value) for key, value in data.items()]
+    elif isinstance(data, list):
+        items = [(_item_key(index, item), item) for index, item in enumerate(data)]
+    else:
+        return []
+    values: list[tuple[str, float]] = []
+    for key, value in items:
+        values.extend(numeric_values(value, f"{path}.{key}" if path else key))
+    return values
+
+
+class EndpointHistory:
+    """
+    Recent numeric values of an endpoint in fixed size ring buffers.
+
+    Each recorded reply takes the next position in the ring buffer of
+    timestamps and of every value path, overwriting the oldest reply
+    when full. Buffers are arrays of doubles, so memory use is fixed by
+    the number of value paths, which is limited to HISTORY_MAX_SERIES.
+    Values missing in a reply are stored as NaN.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Initialize history of size replies."""
+        self.size = size
+        self.count = 0
+        self._next = 0
+        self._times = array("d", [math.nan]) * size
+        self._values: dict[str, array[float]] = {}
+
+    def record(self, data: Any, timestamp: float) -> None:
+        """Record numeric values of reply received at timestamp."""
+        index = self._next
+        self._times[index] = timestamp
+        for values in self._values.values():
+            values[index] = math.nan
+        for path, value in numeric_values(data):
+            if (values := self._values.get(path)) is None:
+                if len(self._values) >= HISTORY_MAX_SERIES:
+                    continue
+                values = self._values[path] = array("d", [math.nan]) * self.size
+            values[index] = value
+        self._next = (index + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def window(
+        self, since: float, patterns: list[str] | None = None
+    ) -> tuple[list[float], dict[str, list[float | None]]]:
+        """
+        Return timestamps and values of replies received since timestamp.
+
+        Only value paths matching one of the wildcard patterns are
+        returned, all if no patterns are given. Missing values are None.
+        """
+        first = (self._next - self.count) % self.size
+        indexes = [
+            index
+            for index in ((first + offset) % self.size for offset in range(self.count))
+            if self._times[index] >= since
+        ]
+        values = {
+            path: [None if math.isnan(value := buffer[i]) else value for i in indexes]
+            for path, buffer in self._values.items()
+            if not patterns or any(fnmatchcase(path, pattern) for pattern in patterns)
+        }
+        return [self._times[index] for index in indexes], values
+
+    @property
+    def memory(self) -> int:
+        """Return bytes used by the ring buffers."""
+        return self._times.itemsize * self.size * (len(self._values) + 1)
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return history size and memory use for diagnostics."""
+        return {
+            "size": self.size,
+            "count": self.count,
+            "series": len(self._values),
+            "memory": self.memory,
+        }
@@ -0,0 +1,113 @@
+"""
+Inverter analysis for Enphase Envoy Raw Data Support.
+
+This custom integration registers an enphase_envoy_raw_data integration
+that only provides a read_data(endpoint) and send_data(endpoint,data)
+action/service. No entities are provided.
+
+!!! SENDING DATA TO AN ENVOY ENDPOINT HAS RISK FOR PROPER OPERATION
+OF THE ENVOY. DOING SO IS AT YOUR OWN RISK AND SHOULD ONLY BE DONE
+FULLY UNDERSTANDING ANY EFFECT OF IT !!!
+
+This integration does not replace the core integration. It can be used next to it
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+PERCENTILES = (10, 25, 50, 75, 90)
+# inverter record keys used in the analysis
+SERIAL_KEY = "serialNumber"
+WATTS_KEY = "lastReportWatts"
+MAX_WATTS_KEY = "maxReportWatts"
+DATE_KEY = "lastReportDate"
+
+
+def _percentiles(values: list[float]) -> dict[str, float] | None:
+    """
+    Return percentiles of sorted values, None if there are no values.
+
+    Values are interpolated between the closest ranks, like the inclusive
+    method of statistics.quantiles.
+    """
+    if not values:
+        return None
+    last = len(values) - 1
+    percentiles: dict[str, float] = {}
+    for percentile in PERCENTILES:
+        rank, fraction = divmod(last * percentile, 100)
+        value = values[rank]
+        if fraction:
+            value += (values[rank + 1] - value) * fraction / 100
+        percentiles[f"p{percentile}"] = round(value, 1)
+    return percentiles
+
+
+def analyze_inverters(
+    inverters: list[Any],
+    now: float,
+    *,
+    stale_after: float,
+    zscore: float,
+) -> dict[str, Any]:
+    """
+    Return statistics of the inverter production reply.
+
+    Inverters without a report in the last stale_after seconds are stale
+    and left out of the totals and power statistics, as their power is
+    outdated. Inverters with power more than zscore standard deviations
+    below the mean are reported as underperforming. The reply is read in
+    1 pass, mean and deviation are summed with math.fsum.
+
+    Raises ValueError if an inverter record is not an object or has a
+    value that is not a number. Missing values are 0.
+    """
+    fresh: list[tuple[str, float]] = []
+    stale: list[dict[str, Any]] = []
+    total_max_watts = 0.0
+    for inverter in inverters:
+        if not isinstance(inverter, dict):
+            msg = f"inverter record {inverter!r}"
+            raise ValueError(msg)  # noqa: TRY004
+        serial = str(inverter.get(SERIAL_KEY))
+        try:
+            watts = float(inverter.get(WATTS_KEY) or 0)
+            max_watts = float(inverter.get(MAX_WATTS_KEY) or 0)
+            date = float(inverter.get(DATE_KEY) or 0)
+        except (TypeError, ValueError) as err:
+            msg = f"inverter {serial}: {err}"
+            raise ValueError(msg) from err
+        if (age := now - date) > stale_after:
+            stale.append({SERIAL_KEY: serial, DATE_KEY: int(date), "age": int(age)})
+            continue
+        fresh.append((serial, watts))
+        total_max_watts += max_watts
+
+    watts = [watts for _, watts in fresh]
+    total_watts = math.fsum(watts)
+    mean = total_watts / len(watts) if watts else 0.0
+    stdev = (
+        math.sqrt(math.fsum((value - mean) ** 2 for value in watts) / len(watts))
+        if watts
+        else 0.0
+    )
+    underperforming = [
+        {SERIAL_KEY: serial, WATTS_KEY: value, "zscore": round(score, 2)}
+        for serial, value in fresh
+        if stdev and (score := (value - mean) / stdev) < -zscore
+    ]
+    watts.sort()
+
+    return {
+        "inverters": len(inverters),
+        "reporting": len(fresh),
+        "total_watts": total_watts,
+        "total_max_watts": total_max_watts,
+        "mean_watts": round(mean, 1),
+        "stdev_watts": round(stdev, 1),
+        "percentiles": _percentiles(watts),
+        "underperforming": underperforming,
+        "stale": stale,
+    }
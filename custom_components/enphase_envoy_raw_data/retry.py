@@ -0,0 +1,80 @@
+"""
+Request retry policy for Enphase Envoy Raw Data Support.
+
+This custom integration registers an enphase_envoy_raw_data integration
+that only provides a read_data(endpoint) and send_data(endpoint,data)
+action/service. No entities are provided.
+
+!!! SENDING DATA TO AN ENVOY ENDPOINT HAS RISK FOR PROPER OPERATION
+OF THE ENVOY. DOING SO IS AT YOUR OWN RISK AND SHOULD ONLY BE DONE
+FULLY UNDERSTANDING ANY EFFECT OF IT !!!
+
+This integration does not replace the core integration. It can be used next to it
+"""
+
+from __future__ import annotations
+
+import random
+from collections import deque
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import RETRY_BASE_DELAY, RETRY_BUDGET_WINDOW, RETRY_MAX_DELAY
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """Return random wait after attempt failed, up to a delay doubling from base."""
+    return random.uniform(0, min(maximum, base * 2 ** (attempt - 1)))  # noqa: S311
+
+
+class EnvoyRetryPolicy:
+    """
+    Retry policy for idempotent requests failing on transient errors.
+
+    A request is tried at most max_attempts times. Before each retry it
+    waits a random time up to an exponentially growing delay. Retries of
+    all requests together are limited to budget per budget window, so
+    retries can not multiply the load on an envoy that is struggling.
+    """
+
+    def __init__(self, max_attempts: int, budget: int) -> None:
+        """Initialize retry policy."""
+        self.max_attempts = max_attempts
+        self.budget = budget
+        self._retries: deque[float] = deque()
+        self.retries = 0
+        self.budget_exhausted = 0
+
+    def delay(self, attempt: int) -> float:
+        """Return seconds to wait before retrying after attempt failed."""
+        return backoff_delay(attempt, RETRY_BASE_DELAY, RETRY_MAX_DELAY)
+
+    def _available(self, now: float) -> int:
+        """Return retries left in budget, forgetting retries outside the window."""
+        while self._retries and now - self._retries[0] >= RETRY_BUDGET_WINDOW:
+            self._retries.popleft()
+        return self.budget - len(self._retries)
+
+    def acquire(self, attempt: int) -> bool:
+        """Return True if a retry after attempt is allowed and take it from budget."""
+        if attempt >= self.max_attempts:
+            return False
+        now = dt_util.utcnow().timestamp()
+        if self._available(now) <= 0:
+            self.budget_exhausted += 1
+            return False
+        self._retries.append(now)
+        self.retries += 1
+        return True
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return retry policy and statistics for diagnostics."""
+        return {
+            "max_attempts": self.max_attempts,
+            "budget": self.budget,
+            "budget_available": self._available(dt_util.utcnow().timestamp()),
+            "retries": self.retries,
+            "budget_exhausted": self.budget_exhausted,
+        }
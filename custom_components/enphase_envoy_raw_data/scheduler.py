@@ -0,0 +1,177 @@
+"""
+Request scheduler for Enphase Envoy Raw Data Support.
+
+This custom integration registers an enphase_envoy_raw_data integration
+that only provides a read_data(endpoint) and send_data(endpoint,data)
+action/service. No entities are provided.
+
+!!! SENDING DATA TO AN ENVOY ENDPOINT HAS RISK FOR PROPER OPERATION
+OF THE ENVOY. DOING SO IS AT YOUR OWN RISK AND SHOULD ONLY BE DONE
+FULLY UNDERSTANDING ANY EFFECT OF IT !!!
+
+This integration does not replace the core integration. It can be used next to it
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+# weight of a new latency measurement in the average latency of an endpoint
+LATENCY_SMOOTHING = 0.2
+# latency above this factor of the endpoint average indicates envoy overload
+LATENCY_TOLERANCE = 2.0
+
+
+class RequestPriority(IntEnum):
+    """Priority of a request to the envoy, lower values are sent first."""
+
+    SEND = 0
+    READ = 1
+    BACKGROUND = 2
+
+
+class EnvoyRequestScheduler:
+    """
+    Limit concurrent requests to an Envoy and order waiting requests.
+
+    Waiting requests are started in order of priority and, within a
+    priority, in order of arrival. A waiting request with a key can be
+    moved up to a higher priority. Queue depth and time spent waiting
+    are tracked for diagnostics.
+
+    The number of active requests is limited by an adaptive limit of at
+    most max_concurrent. The limit is halved when a request fails or
+    its latency rises well above the average for its endpoint, and
+    grows by one after each limit-sized run of normal requests.
+    """
+
+    def __init__(self, max_concurrent: int) -> None:
+        """Initialize scheduler allowing max_concurrent active requests."""
+        self.max_concurrent = max_concurrent
+        self.limit = float(max_concurrent)
+        self.decreases = 0
+        self._latency: dict[str, float] = {}
+        self._last_decrease = 0.0
+        self.active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        # waiting requests by key, with their heap entry
+        self._keyed: dict[str, tuple[int, int, asyncio.Future[None]]] = {}
+        self._sequence = itertools.count()
+        self.requests = 0
+        self.queued = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Return number of requests waiting to be sent."""
+        # a waiter moved up to a higher priority has 2 heap entries
+        return len({future for _, _, future in self._waiters if not future.done()})
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self, priority: RequestPriority = RequestPriority.READ, key: str | None = None
+    ) -> AsyncIterator[None]:
+        """Wait until a request with priority can be sent, hold it while sending."""
+        await self._acquire(priority, key)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def raise_priority(self, key: str, priority: RequestPriority) -> None:
+        """Move the waiting request with key up to priority if that is higher."""
+        if (entry := self._keyed.get(key)) is None or entry[0] <= priority:
+            return
+        # the old entry is skipped once the waiter got its slot
+        entry = self._keyed[key] = (priority, entry[1], entry[2])
+        heapq.heappush(self._waiters, entry)
+
+    async def _acquire(self, priority: RequestPriority, key: str | None) -> None:
+        """Wait for a free request slot."""
+        self.requests += 1
+        if self.active < int(self.limit) and not self.queue_depth:
+            self.active += 1
+            return
+
+        self.queued += 1
+        start = time.monotonic()
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._sequence), future)
+        heapq.heappush(self._waiters, entry)
+        if key is not None:
+            self._keyed[key] = entry
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # slot was granted while being cancelled, pass it on
+                self._release()
+            raise
+        finally:
+            if key is not None and (
+                (keyed := self._keyed.get(key)) and keyed[2] is future
+            ):
+                del self._keyed[key]
+            waited = time.monotonic() - start
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+
+    def _release(self) -> None:
+        """Free a request slot and grant free slots to waiting requests."""
+        self.active -= 1
+        self._grant()
+
+    def _grant(self) -> None:
+        """Grant free request slots to waiting requests in order of priority."""
+        while self._waiters and self.active < int(self.limit):
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                # waiter was cancelled
+                continue
+            self.active += 1
+            future.set_result(None)
+
+    def record(self, endpoint: str, latency: float, *, failed: bool = False) -> None:
+        """Adjust the concurrency limit to the outcome of a finished request."""
+        average = self._latency.get(endpoint, latency)
+        self._latency[endpoint] = (
+            1 - LATENCY_SMOOTHING
+        ) * average + LATENCY_SMOOTHING * latency
+        if failed or latency > LATENCY_TOLERANCE * average:
+            # decrease once for requests that were active at the same time
+            now = time.monotonic()
+            if now - self._last_decrease >= average:
+                self._last_decrease = now
+                self.limit = max(1.0, self.limit / 2)
+                self.decreases += 1
+            return
+        if (limit := self.limit) < self.max_concurrent:
+            self.limit = min(float(self.max_concurrent), limit + 1 / limit)
+            self._grant()
+
+    @property
+    def occupancy(self) -> dict[str, Any]:
+        """Return scheduler state and statistics for diagnostics."""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "limit": round(self.limit, 2),
+            "decreases": self.decreases,
+            "active": self.active,
+            "queue_depth": self.queue_depth,
+            "requests": self.requests,
+            "queued": self.queued,
+            "wait_time_avg": round(self.wait_time_total / self.queued, 3)
+            if self.queued
+            else 0.0,
+            "wait_time_max": round(self.wait_time_max, 3),
+        }
@@ -14,12 +14,15 @@ This integration does not replace the core integration. It can be used next to i
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
+import math
 from typing import TYPE_CHECKING, Any, Never
 
 import orjson
 import voluptuous as vol
-from aiohttp import ClientError, ClientResponse
+from aiohttp import ClientError
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.core import (
     HomeAssistant,
@@ -28,20 +31,52 @@ from homeassistant.core import (
     SupportsResponse,
 )
 from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
-from pyenphase import EnvoyError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+from pyenphase import EnvoyError, EnvoyHTTPStatusError
+from pyenphase.const import URL_PRODUCTION_INVERTERS
 
-from .const import DOMAIN, INVALID_AUTH_ERRORS
+from .breaker import EnvoyUnavailableError
+from .const import (
+    DEFAULT_STALE_REPORT_AGE,
+    DEFAULT_UNDERPERFORMING_ZSCORE,
+    DEVICE_INDEX_KEYS,
+    DOMAIN,
+    STREAM_ENDPOINT,
+)
+from .inverters import analyze_inverters
 
 if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from .cache import EnvoyCacheEntry
     from .coordinator import EnphaseRawDataUpdateCoordinator
 
 ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_CONFIG_ENTRY_IDS = "config_entry_ids"
 ATTR_ENDPOINT = "endpoint"
+ATTR_ENDPOINTS = "endpoints"
 ATTR_DATA = "data"
 ATTR_METHOD = "method"
 ATTR_RISK_ACKNOWLEDGED = "risk_acknowledged"
 ATTR_VALIDATE_MODE = "test_mode"
 ATTR_FROM_CACHE = "from_cache"
+ATTR_MAX_AGE = "max_age"
+ATTR_STALE_WHILE_REVALIDATE = "stale_while_revalidate"
+ATTR_TIMEOUT = "timeout"
+ATTR_PATHS = "paths"
+ATTR_DURATION = "duration"
+ATTR_TIME = "time"
+ATTR_VALUES = "values"
+ATTR_STALE_AFTER = "stale_after"
+ATTR_ZSCORE = "zscore"
+ATTR_SERIAL = "serial"
+ATTR_METADATA = "metadata"
+ATTR_STATUS = "status"
+ATTR_ERROR = "error"
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
 
 REQUESTERRORS = (EnvoyError, ClientError)
 
@@ -75,90 +110,242 @@ def _find_envoy_coordinator(
     hass: HomeAssistant, call: ServiceCall
 ) -> EnphaseRawDataUpdateCoordinator:
     """Find envoy config entry from service data and return envoy coordinator."""
-    identifier = str(call.data.get(ATTR_CONFIG_ENTRY_ID))
+    return _get_envoy_coordinator(hass, str(call.data.get(ATTR_CONFIG_ENTRY_ID)))
+
+
+def _get_envoy_coordinator(
+    hass: HomeAssistant, identifier: str
+) -> EnphaseRawDataUpdateCoordinator:
+    """Return envoy coordinator for config entry id."""
     _LOGGER.debug("Finding coordinator for %s", identifier)
-    if not (entry := hass.config_entries.async_get_entry(identifier)):
+    if (
+        not (entry := hass.config_entries.async_get_entry(identifier))
+        or entry.domain != DOMAIN
+    ):
         _raise_validation("envoy_service_no_config", identifier)
     if entry.state is not ConfigEntryState.LOADED:
         _raise_validation("not_initialized", identifier)
 
     coordinator: EnphaseRawDataUpdateCoordinator = entry.runtime_data
-    if (
-        not (coordinator)
-        or not (envoy_to_use := coordinator.envoy)
-        or not envoy_to_use.data
-        or not envoy_to_use.data.raw
-    ):
+    if not (coordinator) or not coordinator.envoy or not coordinator.data:
         _raise_validation("not_initialized", identifier)
     return coordinator
 
 
+def _cache_max_age(
+    call: ServiceCall, coordinator: EnphaseRawDataUpdateCoordinator, endpoint: str
+) -> float | None:
+    """Return max age of cached reply to use, endpoint ttl if only from_cache set."""
+    if (max_age := call.data.get(ATTR_MAX_AGE)) is None and (
+        call.data.get(ATTR_FROM_CACHE, False)
+        or call.data.get(ATTR_STALE_WHILE_REVALIDATE, False)
+    ):
+        max_age = coordinator.cache.ttl(endpoint)
+    return max_age
+
+
+@contextlib.contextmanager
+def _envoy_errors(
+    call: ServiceCall,
+    coordinator: EnphaseRawDataUpdateCoordinator,
+    endpoint: str,
+    deadline: asyncio.Timeout,
+) -> Generator[None]:
+    """Raise HomeAssistant error for errors communicating with the envoy."""
+    host = coordinator.envoy.host
+    try:
+        yield
+    except EnvoyHTTPStatusError as err:
+        _raise_ha_error(call, "envoy_error", f"{host}{endpoint}", f"{err.status_code}")
+    except EnvoyUnavailableError as err:
+        _raise_ha_error(call, "envoy_unavailable", host, err.args[0])
+    except TimeoutError:
+        # only the timeout set for the call expiring is reported as such
+        if not deadline.expired():
+            _raise_ha_error(call, "envoy_error", host, "timeout")
+        timeout = call.data[ATTR_TIMEOUT]
+        _raise_ha_error(call, "envoy_timeout", f"{host}{endpoint}", f"{timeout}")
+    except REQUESTERRORS as err:
+        _raise_ha_error(call, "envoy_error", host, err.args[0])
+
+
 async def _envoy_request(
-    hass: HomeAssistant,
     call: ServiceCall,
+    coordinator: EnphaseRawDataUpdateCoordinator,
     endpoint: str,
     method: str | None = None,
     data: dict[str, Any] | None = None,
-    to_cache: bool = False,  # noqa: FBT001, FBT002
-    from_cache: bool = False,  # noqa: FBT001, FBT002
 ) -> Any:
-    """Send request to envoy an return reply."""
-    coordinator = _find_envoy_coordinator(hass, call)
-    envoy_to_use = coordinator.envoy
-    if from_cache and envoy_to_use.data and endpoint in envoy_to_use.data.raw:
+    """Send request to envoy an return reply, within timeout if set for call."""
+    deadline = asyncio.timeout(call.data.get(ATTR_TIMEOUT))
+    with _envoy_errors(call, coordinator, endpoint, deadline):
+        async with deadline:
+            return await coordinator.async_request(endpoint, data, method)
+
+
+async def _envoy_read(
+    call: ServiceCall,
+    coordinator: EnphaseRawDataUpdateCoordinator,
+    endpoint: str,
+    max_age: float | None = None,
+    *,
+    stale_while_revalidate: bool = False,
+) -> tuple[EnvoyCacheEntry, dict[str, Any]]:
+    """
+    Return endpoint reply from cache or envoy and metadata describing it.
+
+    Cached reply is used when not older than max_age seconds, without max_age
+    the envoy is always used. Concurrent reads for the same endpoint share
+    one envoy request. Replies received from the envoy are cached.
+
+    With stale_while_revalidate an older cached reply is returned as well
+    while a background read refreshes the cache. When the envoy is not
+    reachable or does not reply within the timeout set for the call, a
+    cached reply of any age is used if max_age is set.
+
+    The meter stream endpoint never completes a reply, so it is never
+    requested. Its latest cached reading of any age is returned instead.
+    """
+    if endpoint.split("?", 1)[0] == STREAM_ENDPOINT:
+        if not (entry := coordinator.cache.get(STREAM_ENDPOINT, math.inf)):
+            _raise_validation("stream_not_available", endpoint)
+        return entry, entry.as_metadata(from_cache=True)
+
+    if max_age is not None and (entry := coordinator.cache.get(endpoint, max_age)):
         _LOGGER.debug(
-            "envoy_request, return data from cache %s", envoy_to_use.data.raw[endpoint]
+            "envoy_read, return data from cache, age %s: %s", entry.age(), entry.data
         )
-        return envoy_to_use.data.raw[endpoint]
-    # handle auth changes due to envoy restart or token expiry
-    for tries in range(2):
+        return entry, entry.as_metadata(from_cache=True)
+
+    if stale_while_revalidate and (entry := coordinator.cache.get(endpoint, math.inf)):
+        _LOGGER.debug("envoy_read, return stale data from cache, age %s", entry.age())
+        coordinator.async_revalidate(endpoint)
+        return entry, entry.as_metadata(from_cache=True, stale=True)
+
+    deadline = asyncio.timeout(call.data.get(ATTR_TIMEOUT))
+    with _envoy_errors(call, coordinator, endpoint, deadline):
         try:
-            _LOGGER.debug("envoy_request, sending request to %s", endpoint)
-            response: ClientResponse = await envoy_to_use.request(
-                endpoint, data, method
+            async with deadline:
+                entry, callers, retries = await coordinator.async_read(endpoint)
+        except (EnvoyUnavailableError, TimeoutError) as err:
+            # caller accepts cached data, use it regardless of age
+            if max_age is None or not (
+                entry := coordinator.cache.get(endpoint, math.inf)
+            ):
+                raise
+            fallback = (
+                "envoy_unavailable"
+                if isinstance(err, EnvoyUnavailableError)
+                else "timeout"
             )
-        except INVALID_AUTH_ERRORS as err:
-            if tries == 0:
-                # token likely expired or firmware changed, try to re-authenticate
-                await coordinator.try_reauthenticate()
-                continue
-            _raise_ha_error(call, "envoy_error", envoy_to_use.host, err.args[0])
-        except REQUESTERRORS as err:
-            _raise_ha_error(call, "envoy_error", envoy_to_use.host, err.args[0])
-        break
-
-    if not (200 <= response.status < 300):  # noqa: PLR2004
-        _raise_ha_error(
-            call, "envoy_error", f"{envoy_to_use.host}{endpoint}", f"{response.status}"
+            return entry, entry.as_metadata(from_cache=True, fallback=fallback)
+    return entry, entry.as_metadata(
+        from_cache=False, coalesced_callers=callers, retries=retries
+    )
+
+
+async def _envoy_read_status(
+    call: ServiceCall, coordinator: EnphaseRawDataUpdateCoordinator, endpoint: str
+) -> dict[str, Any]:
+    """Read endpoint from envoy or cache, return status with data or error."""
+    max_age = _cache_max_age(call, coordinator, endpoint)
+    try:
+        entry, metadata = await _envoy_read(call, coordinator, endpoint, max_age)
+    except HomeAssistantError as err:
+        _LOGGER.debug(
+            "%s, %s %s failed: %s", call.service, coordinator.name, endpoint, err
         )
-    _LOGGER.debug("envoy_request, request status %s", response.status)
+        return {ATTR_STATUS: STATUS_ERROR, ATTR_ERROR: str(err)}
+    return {ATTR_STATUS: STATUS_OK, ATTR_DATA: entry.data, ATTR_METADATA: metadata}
+
 
+def _read_history(
+    call: ServiceCall, coordinator: EnphaseRawDataUpdateCoordinator
+) -> dict[str, Any]:
+    """Return timestamps and values of endpoint history within call duration."""
+    endpoint = call.data[ATTR_ENDPOINT]
+    if not (history := coordinator.history.get(endpoint)):
+        _raise_validation("history_not_available", endpoint)
+    since = (
+        dt_util.utcnow().timestamp() - duration
+        if (duration := call.data.get(ATTR_DURATION)) is not None
+        else -math.inf
+    )
+    times, values = history.window(since, call.data.get(ATTR_PATHS))
+    _LOGGER.debug(
+        "read_history_service, %s replies of %s since %s", len(times), endpoint, since
+    )
+    return {
+        endpoint: {
+            ATTR_TIME: [
+                dt_util.utc_from_timestamp(timestamp).isoformat() for timestamp in times
+            ],
+            ATTR_VALUES: values,
+        }
+    }
+
+
+async def _analyze_inverters(
+    call: ServiceCall, coordinator: EnphaseRawDataUpdateCoordinator
+) -> dict[str, Any]:
+    """Return statistics of inverter production from cache or envoy."""
+    max_age = call.data.get(
+        ATTR_MAX_AGE, coordinator.cache.ttl(URL_PRODUCTION_INVERTERS)
+    )
+    entry, metadata = await _envoy_read(
+        call, coordinator, URL_PRODUCTION_INVERTERS, max_age
+    )
+    if not isinstance(entry.data, list):
+        _raise_ha_error(
+            call,
+            "envoy_error",
+            f"{coordinator.envoy.host}{URL_PRODUCTION_INVERTERS}",
+            "unexpected reply",
+        )
     try:
-        result = orjson.loads(await response.read())
-    except orjson.JSONDecodeError, ValueError:
-        # it's xml or html
-        _LOGGER.debug("envoy_request, No JSON data returned, decode it")
-        result = await response.text()
-    if to_cache and envoy_to_use.data:
-        envoy_to_use.data.raw[endpoint] = result
-    return result
+        analysis = analyze_inverters(
+            entry.data,
+            dt_util.utcnow().timestamp(),
+            stale_after=call.data[ATTR_STALE_AFTER],
+            zscore=call.data[ATTR_ZSCORE],
+        )
+    except ValueError as err:
+        _raise_validation("invalid_inverter_data", str(err))
+    return analysis | {ATTR_METADATA: metadata}
+
 
+async def _get_device(
+    call: ServiceCall, coordinator: EnphaseRawDataUpdateCoordinator
+) -> dict[str, Any]:
+    """Return one device record of an indexed endpoint from cache or envoy."""
+    endpoint = call.data[ATTR_ENDPOINT]
+    serial = call.data[ATTR_SERIAL]
+    if endpoint not in DEVICE_INDEX_KEYS:
+        _raise_validation("device_index_not_available", endpoint)
+    max_age = call.data.get(ATTR_MAX_AGE, coordinator.cache.ttl(endpoint))
+    entry, metadata = await _envoy_read(call, coordinator, endpoint, max_age)
+    if entry.index is None or (device := entry.index.get(serial)) is None:
+        _raise_validation("device_not_found", f"{serial} in {endpoint}")
+    return {serial: device, ATTR_METADATA: metadata}
 
-async def setup_hass_services(hass: HomeAssistant) -> ServiceResponse:
+
+async def setup_hass_services(hass: HomeAssistant) -> ServiceResponse:  # noqa: PLR0915
     """Configure Home Assistant services for Enphase_Envoy."""
 
     async def read_data_service(call: ServiceCall) -> ServiceResponse:
         """Send GET request to envoy."""
         endpoint = call.data[ATTR_ENDPOINT]
         _LOGGER.debug("read_data_service, reading endpoint %s", endpoint)
-        reply = await _envoy_request(
-            hass,
+        coordinator = _find_envoy_coordinator(hass, call)
+        max_age = _cache_max_age(call, coordinator, endpoint)
+        entry, metadata = await _envoy_read(
             call,
-            endpoint=endpoint,
-            to_cache=True,
-            from_cache=call.data.get(ATTR_FROM_CACHE, False),
+            coordinator,
+            endpoint,
+            max_age,
+            stale_while_revalidate=call.data.get(ATTR_STALE_WHILE_REVALIDATE, False),
         )
-        return {endpoint: reply}
+        return {endpoint: entry.data, ATTR_METADATA: metadata}
 
     # declare read request services
     hass.services.async_register(
@@ -170,6 +357,178 @@ async def setup_hass_services(hass: HomeAssistant) -> ServiceResponse:
                 vol.Required(ATTR_CONFIG_ENTRY_ID): str,
                 vol.Required(ATTR_ENDPOINT): str,
                 vol.Optional(ATTR_FROM_CACHE): bool,
+                vol.Optional(ATTR_MAX_AGE): vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                ),
+                vol.Optional(ATTR_STALE_WHILE_REVALIDATE): bool,
+                vol.Optional(ATTR_TIMEOUT): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, min_included=False)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def read_many_service(call: ServiceCall) -> ServiceResponse:
+        """Send GET requests for multiple endpoints to envoy concurrently."""
+        coordinator = _find_envoy_coordinator(hass, call)
+        # remove duplicates, keep order
+        endpoints: list[str] = list(dict.fromkeys(call.data[ATTR_ENDPOINTS]))
+        _LOGGER.debug("read_many_service, reading endpoints %s", endpoints)
+
+        replies = await asyncio.gather(
+            *(_envoy_read_status(call, coordinator, endpoint) for endpoint in endpoints)
+        )
+        return dict(zip(endpoints, replies, strict=True))
+
+    # declare read multiple endpoints request services
+    hass.services.async_register(
+        DOMAIN,
+        "read_many",
+        read_many_service,
+        schema=vol.Schema(
+            {
+                vol.Required(ATTR_CONFIG_ENTRY_ID): str,
+                vol.Required(ATTR_ENDPOINTS): vol.All(
+                    cv.ensure_list, [str], vol.Length(min=1)
+                ),
+                vol.Optional(ATTR_FROM_CACHE): bool,
+                vol.Optional(ATTR_MAX_AGE): vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                ),
+                vol.Optional(ATTR_TIMEOUT): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, min_included=False)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def read_envoys_service(call: ServiceCall) -> ServiceResponse:
+        """Send GET request for endpoint to multiple envoys concurrently."""
+        if identifiers := call.data.get(ATTR_CONFIG_ENTRY_IDS):
+            entry_ids = list(dict.fromkeys(identifiers))
+        elif not (
+            entry_ids := [
+                entry.entry_id
+                for entry in hass.config_entries.async_loaded_entries(DOMAIN)
+            ]
+        ):
+            _raise_validation("envoy_service_no_config", DOMAIN)
+        coordinators = [
+            _get_envoy_coordinator(hass, entry_id) for entry_id in entry_ids
+        ]
+        endpoint = call.data[ATTR_ENDPOINT]
+        _LOGGER.debug(
+            "read_envoys_service, reading endpoint %s from %s", endpoint, entry_ids
+        )
+
+        replies = await asyncio.gather(
+            *(
+                _envoy_read_status(call, coordinator, endpoint)
+                for coordinator in coordinators
+            )
+        )
+        return {
+            coordinator.envoy_serial_number: {
+                ATTR_CONFIG_ENTRY_ID: coordinator.config_entry.entry_id
+            }
+            | reply
+            for coordinator, reply in zip(coordinators, replies, strict=True)
+        }
+
+    # declare read endpoint from multiple envoys request services
+    hass.services.async_register(
+        DOMAIN,
+        "read_envoys",
+        read_envoys_service,
+        schema=vol.Schema(
+            {
+                vol.Optional(ATTR_CONFIG_ENTRY_IDS): vol.All(cv.ensure_list, [str]),
+                vol.Required(ATTR_ENDPOINT): str,
+                vol.Optional(ATTR_FROM_CACHE): bool,
+                vol.Optional(ATTR_MAX_AGE): vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                ),
+                vol.Optional(ATTR_TIMEOUT): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, min_included=False)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def read_history_service(call: ServiceCall) -> ServiceResponse:
+        """Return recent numeric values of a watched endpoint from memory."""
+        return _read_history(call, _find_envoy_coordinator(hass, call))
+
+    # declare read history services
+    hass.services.async_register(
+        DOMAIN,
+        "read_history",
+        read_history_service,
+        schema=vol.Schema(
+            {
+                vol.Required(ATTR_CONFIG_ENTRY_ID): str,
+                vol.Required(ATTR_ENDPOINT): str,
+                vol.Optional(ATTR_PATHS): vol.All(cv.ensure_list, [str]),
+                vol.Optional(ATTR_DURATION): vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def get_device_service(call: ServiceCall) -> ServiceResponse:
+        """Return one device record of an endpoint reply."""
+        return await _get_device(call, _find_envoy_coordinator(hass, call))
+
+    # declare device lookup services
+    hass.services.async_register(
+        DOMAIN,
+        "get_device",
+        get_device_service,
+        schema=vol.Schema(
+            {
+                vol.Required(ATTR_CONFIG_ENTRY_ID): str,
+                vol.Required(ATTR_ENDPOINT): str,
+                vol.Required(ATTR_SERIAL): cv.string,
+                vol.Optional(ATTR_MAX_AGE): vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                ),
+                vol.Optional(ATTR_TIMEOUT): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, min_included=False)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def analyze_inverters_service(call: ServiceCall) -> ServiceResponse:
+        """Return statistics of inverter production."""
+        return await _analyze_inverters(call, _find_envoy_coordinator(hass, call))
+
+    # declare inverter analysis services
+    hass.services.async_register(
+        DOMAIN,
+        "analyze_inverters",
+        analyze_inverters_service,
+        schema=vol.Schema(
+            {
+                vol.Required(ATTR_CONFIG_ENTRY_ID): str,
+                vol.Optional(ATTR_MAX_AGE): vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                ),
+                vol.Optional(
+                    ATTR_STALE_AFTER, default=DEFAULT_STALE_REPORT_AGE
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    ATTR_ZSCORE, default=DEFAULT_UNDERPERFORMING_ZSCORE
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(ATTR_TIMEOUT): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, min_included=False)
+                ),
             }
         ),
         supports_response=SupportsResponse.OPTIONAL,
@@ -201,8 +560,8 @@ async def setup_hass_services(hass: HomeAssistant) -> ServiceResponse:
             return {endpoint: data_to_send}
         try:
             reply = await _envoy_request(
-                hass,
                 call,
+                _find_envoy_coordinator(hass, call),
                 endpoint=endpoint,
                 method=call.data.get(ATTR_METHOD),
                 data=data_to_send,
@@ -228,6 +587,9 @@ async def setup_hass_services(hass: HomeAssistant) -> ServiceResponse:
                 vol.Required(ATTR_METHOD): vol.In(["PUT", "POST", "DELETE"]),
                 vol.Required(ATTR_RISK_ACKNOWLEDGED): bool,
                 vol.Required(ATTR_VALIDATE_MODE): bool,
+                vol.Optional(ATTR_TIMEOUT): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, min_included=False)
+                ),
             }
         ),
         supports_response=SupportsResponse.OPTIONAL,
@@ -0,0 +1,219 @@
+"""
+Meter stream for Enphase Envoy Raw Data Support.
+
+This custom integration registers an enphase_envoy_raw_data integration
+that only provides a read_data(endpoint) and send_data(endpoint,data)
+action/service. No entities are provided.
+
+!!! SENDING DATA TO AN ENVOY ENDPOINT HAS RISK FOR PROPER OPERATION
+OF THE ENVOY. DOING SO IS AT YOUR OWN RISK AND SHOULD ONLY BE DONE
+FULLY UNDERSTANDING ANY EFFECT OF IT !!!
+
+This integration does not replace the core integration. It can be used next to it
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+import orjson
+from aiohttp import ClientError
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+from pyenphase import EnvoyAuthenticationRequired, EnvoyError
+from pyenphase.exceptions import EnvoyHTTPStatusError
+
+from .aggregate import MeterAggregator
+from .const import (
+    EVENT_METER_STREAM,
+    STREAM_ENDPOINT,
+    STREAM_READ_TIMEOUT,
+    STREAM_RECONNECT_BASE_DELAY,
+    STREAM_RECONNECT_MAX_DELAY,
+)
+from .retry import backoff_delay
+
+if TYPE_CHECKING:
+    from .coordinator import EnphaseRawDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STREAM_TIMEOUT = aiohttp.ClientTimeout(
+    total=None, connect=10, sock_read=STREAM_READ_TIMEOUT
+)
+
+
+class EnvoyMeterStream:
+    """
+    Receive meter readings from the envoy stream endpoint.
+
+    One long lived connection replaces frequent reads of the meter
+    readings. Each reading replaces the latest reading. At most every
+    interval seconds the latest reading is stored in the cache as reply
+    of the stream endpoint and fired as event. With a bucket size, the
+    readings are aggregated instead and only bucket summaries are fired
+    as event. A broken stream is reconnected after a random wait that
+    grows with each failure. When the stream is still rejected after 1
+    re-authentication, the credentials lack the rights for it and the
+    stream is stopped.
+    """
+
+    def __init__(
+        self,
+        coordinator: EnphaseRawDataUpdateCoordinator,
+        interval: float,
+        bucket: float = 0,
+    ) -> None:
+        """Initialize stream forwarding readings every interval seconds."""
+        self.coordinator = coordinator
+        self.interval = interval
+        self.aggregator = MeterAggregator(bucket) if bucket else None
+        self.latest: dict[str, Any] | None = None
+        self.connected = False
+        self.connects = 0
+        self.disconnects = 0
+        self.samples = 0
+        self.events = 0
+        self.unauthorized = False
+        self._reauthenticated = False
+        self._last_event = 0.0
+        self._task: asyncio.Task[None] | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start receiving the stream in the background."""
+        coordinator = self.coordinator
+        self._task = coordinator.config_entry.async_create_background_task(
+            coordinator.hass, self._async_run(), f"{coordinator.name} meter stream"
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop receiving the stream."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self.connected = False
+
+    async def _async_run(self) -> None:
+        """Receive the stream, reconnect when it breaks."""
+        attempt = 0
+        while True:
+            samples = self.samples
+            try:
+                await self._async_receive()
+            except (ClientError, TimeoutError, EnvoyError, HomeAssistantError) as err:
+                _LOGGER.debug("%s: meter stream failed: %s", self.coordinator.name, err)
+            except Exception:
+                # keep the stream running, like an overlong line from the reader
+                _LOGGER.exception(
+                    "%s: unexpected meter stream error", self.coordinator.name
+                )
+            self.connected = False
+            if self.unauthorized:
+                return
+            self.disconnects += 1
+            # start over with short waits when the stream was working
+            attempt = 1 if self.samples > samples else attempt + 1
+            await asyncio.sleep(
+                backoff_delay(
+                    attempt, STREAM_RECONNECT_BASE_DELAY, STREAM_RECONNECT_MAX_DELAY
+                )
+            )
+
+    async def _async_receive(self) -> None:
+        """Connect to the stream and process readings until it ends."""
+        coordinator = self.coordinator
+        if (auth := coordinator.envoy.auth) is None:
+            msg = "Not authenticated"
+            raise EnvoyAuthenticationRequired(msg)
+        generation = coordinator.auth_generation
+        async with coordinator.pool.session.get(
+            auth.get_endpoint_url(STREAM_ENDPOINT),
+            headers=auth.headers,
+            middlewares=(auth.auth,) if auth.auth else None,
+            timeout=STREAM_TIMEOUT,
+            allow_redirects=False,
+        ) as response:
+            if response.status in (HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN):
+                if self._reauthenticated:
+                    # re-authenticating again would not help, only load the envoy
+                    self.unauthorized = True
+                    _LOGGER.warning(
+                        "%s: meter stream stopped, not authorized with status %s,"
+                        " it may require installer credentials",
+                        coordinator.name,
+                        response.status,
+                    )
+                    return
+                self._reauthenticated = True
+                await coordinator.async_reauthenticate(generation)
+                msg = f"Authentication failed with status {response.status}"
+                raise EnvoyAuthenticationRequired(msg)
+            if not (200 <= response.status < 300):  # noqa: PLR2004
+                raise EnvoyHTTPStatusError(response.status, STREAM_ENDPOINT)
+            self._reauthenticated = False
+            self.connected = True
+            self.connects += 1
+            _LOGGER.debug("%s: meter stream connected", coordinator.name)
+            # server sent events, each reading on a line as data: {json}
+            async for line in response.content:
+                if not line.startswith(b"data:"):
+                    continue
+                try:
+                    sample = orjson.loads(line[5:])
+                except orjson.JSONDecodeError:
+                    sample = None
+                if not isinstance(sample, dict):
+                    _LOGGER.debug(
+                        "%s: invalid meter reading: %s", coordinator.name, line
+                    )
+                    continue
+                self._async_sample(sample)
+
+    @callback
+    def _async_sample(self, sample: dict[str, Any]) -> None:
+        """Store reading as latest and forward it when interval has passed."""
+        self.samples += 1
+        self.latest = sample
+        if self.aggregator:
+            summary = self.aggregator.add(sample, dt_util.utcnow().timestamp())
+            if summary:
+                self._async_fire(summary)
+            return
+        now = time.monotonic()
+        if self.events and now - self._last_event < self.interval:
+            return
+        self._last_event = now
+        self._async_fire({"data": sample})
+
+    @callback
+    def _async_fire(self, event_data: dict[str, Any]) -> None:
+        """Fire meter stream event and cache the latest reading."""
+        self.events += 1
+        coordinator = self.coordinator
+        coordinator.cache.set(STREAM_ENDPOINT, self.latest)
+        coordinator.hass.bus.async_fire(
+            EVENT_METER_STREAM,
+            {"config_entry_id": coordinator.config_entry.entry_id} | event_data,
+        )
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return stream state and statistics for diagnostics."""
+        return {
+            "interval": self.interval,
+            "bucket": self.aggregator.bucket if self.aggregator else None,
+            "connected": self.connected,
+            "connects": self.connects,
+            "disconnects": self.disconnects,
+            "samples": self.samples,
+            "events": self.events,
+            "unauthorized": self.unauthorized,
+        }
@@ -1,7 +1,7 @@
 """Define test fixtures for Enphase Envoy."""
 
 from typing import TYPE_CHECKING, Any
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import jwt
 import multidict
@@ -55,6 +55,12 @@ def auto_enable_custom_integrations(enable_custom_integrations) -> None:  # noqa
     return
 
 
+@pytest.fixture(autouse=True)
+def auto_mock_async_zeroconf(mock_async_zeroconf: MagicMock) -> None:
+    """Mock the zeroconf instance used to resolve .local names."""
+    return
+
+
 @pytest.fixture
 def mock_setup_entry() -> Generator[AsyncMock]:
     """Override async_setup_entry."""
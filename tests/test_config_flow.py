@@ -17,9 +17,26 @@ from pyenphase import EnvoyAuthenticationError, EnvoyError, EnvoyTokenAuth
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.enphase_envoy_raw_data.const import (
+    CONF_CACHE_SIZE,
+    CONF_FULL_UPDATE,
+    CONF_HISTORY_SIZE,
     CONF_MANUAL_TOKEN,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_METER_STREAM,
+    CONF_RETRY_ATTEMPTS,
+    CONF_RETRY_BUDGET,
+    CONF_STREAM_BUCKET,
+    CONF_STREAM_INTERVAL,
+    CONF_WATCH_ENDPOINTS,
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_RETRY_ATTEMPTS,
+    DEFAULT_RETRY_BUDGET,
+    DEFAULT_STREAM_BUCKET,
+    DEFAULT_STREAM_INTERVAL,
     DOMAIN,
     ENVOY_NAME,
+    MAX_CONCURRENT_REQUESTS,
     UNIQUE_ID,
 )
 
@@ -768,3 +785,49 @@ async def test_reconfigure_switch_from_token(
     assert config_entry.data[CONF_PASSWORD] == "test-password2"
     assert config_entry.data[CONF_TOKEN] == mock_envoy.auth.token
     assert not config_entry.data[CONF_MANUAL_TOKEN]
+
+
+async def test_options_watch_endpoints(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    mock_envoy: AsyncMock,
+) -> None:
+    """Test options flow for watched endpoints."""
+    await setup_integration(hass, config_entry)
+
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_WATCH_ENDPOINTS: {"ivp/meters/readings": 1}},
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {CONF_WATCH_ENDPOINTS: "invalid_watch_endpoints"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_WATCH_ENDPOINTS: {
+                "/ivp/meters/readings": 10,
+                "/api/v1/production/inverters": "300",
+            }
+        },
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert config_entry.options == {
+        CONF_WATCH_ENDPOINTS: {
+            "/ivp/meters/readings": 10,
+            "/api/v1/production/inverters": 300,
+        },
+        CONF_FULL_UPDATE: False,
+        CONF_CACHE_SIZE: DEFAULT_CACHE_SIZE,
+        CONF_MAX_CONCURRENT_REQUESTS: MAX_CONCURRENT_REQUESTS,
+        CONF_RETRY_ATTEMPTS: DEFAULT_RETRY_ATTEMPTS,
+        CONF_RETRY_BUDGET: DEFAULT_RETRY_BUDGET,
+        CONF_METER_STREAM: False,
+        CONF_STREAM_INTERVAL: DEFAULT_STREAM_INTERVAL,
+        CONF_STREAM_BUCKET: DEFAULT_STREAM_BUCKET,
+        CONF_HISTORY_SIZE: DEFAULT_HISTORY_SIZE,
+    }
@@ -1,11 +1,17 @@
 """Test Enphase Envoy runtime."""
 
+import asyncio
 import logging
+import socket
+import time
 from datetime import timedelta
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import orjson
 import pytest
 import respx
+from aiohttp import AsyncResolver, ClientError
 from freezegun.api import FrozenDateTimeFactory
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import (
@@ -18,18 +24,39 @@ from homeassistant.const import (
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
 from jwt import encode
-from pyenphase import EnvoyAuthenticationError, EnvoyError, EnvoyTokenAuth
+from pyenphase import (
+    EnvoyAuthenticationError,
+    EnvoyAuthenticationRequired,
+    EnvoyError,
+    EnvoyTokenAuth,
+)
 from pyenphase.auth import EnvoyLegacyAuth
 from pytest_homeassistant_custom_component.common import (
     MockConfigEntry,
+    async_capture_events,
     async_fire_time_changed,
 )
 
-from custom_components.enphase_envoy_raw_data.const import DOMAIN
+from custom_components.enphase_envoy_raw_data.aggregate import MeterAggregator
+from custom_components.enphase_envoy_raw_data.const import (
+    CACHE_SAVE_DELAY,
+    CONF_CACHE_SIZE,
+    CONF_FULL_UPDATE,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_RETRY_ATTEMPTS,
+    CONF_WATCH_ENDPOINTS,
+    DNS_CACHE_TTL,
+    DOMAIN,
+    EVENT_METER_STREAM,
+    PROBE_ENDPOINT,
+    STREAM_ENDPOINT,
+)
 from custom_components.enphase_envoy_raw_data.coordinator import (
     FIRMWARE_REFRESH_INTERVAL,
 )
+from custom_components.enphase_envoy_raw_data.scheduler import RequestPriority
 
 from . import setup_integration
 
@@ -214,7 +241,7 @@ async def test_coordinator_update_error(
     assert config_entry.runtime_data.envoy == mock_envoy
     coordinator = config_entry.runtime_data
 
-    mock_envoy.update.side_effect = EnvoyError("This must fail")
+    mock_envoy.request.side_effect = EnvoyError("This must fail")
     with pytest.raises(
         UpdateFailed,
         match="Error communicating with Envoy API on",
@@ -232,7 +259,7 @@ async def test_coordinator_update_authentication_error(
     await setup_integration(hass, config_entry)
     coordinator = config_entry.runtime_data
 
-    mock_envoy.update.side_effect = EnvoyAuthenticationError("This must fail")
+    mock_envoy.request.side_effect = EnvoyAuthenticationError("This must fail")
     with pytest.raises(
         ConfigEntryAuthFailed,
         match="Envoy authentication failure on",
@@ -428,12 +455,14 @@ async def test_coordinator_firmware_change_detection(
     assert envoy.firmware == "7.6.175"
 
     caplog.set_level(logging.WARNING)
+    coordinator.cache.set_failure("/not_found", 404)
 
     with patch(
         "custom_components.enphase_envoy_raw_data.Envoy.setup",
         MagicMock(return_value=mock_envoy_setup(mock_envoy)),  # type: ignore [func-returns-value]
     ):
         await coordinator._async_update_data()  # noqa: SLF001
+        assert coordinator.cache.get_failure("/not_found") is None
         await hass.async_block_till_done(wait_background_tasks=True)
         mock_envoy.setup.assert_called_once_with()
         assert (
@@ -469,3 +498,775 @@ async def test_coordinator_firmware_refresh_with_envoy_error(
     await hass.async_block_till_done(wait_background_tasks=True)
 
     assert "Error reading firmware:" in caplog.text
+
+
+async def test_coordinator_watch_endpoints(
+    hass: HomeAssistant,
+    config: dict[str, str],
+    mock_envoy: AsyncMock,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test background polls of watched endpoints."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="45a36e55aaddb2007c5f6602e0c38e72",
+        title="Envoy 1234",
+        unique_id=f"{DOMAIN}_for_1234",
+        data=config,
+        options={
+            CONF_WATCH_ENDPOINTS: {
+                "/ivp/meters/readings": 10,
+                "/api/v1/production/inverters": 300,
+            }
+        },
+    )
+    mock_envoy.request.return_value.read.return_value = b'{"wattsNow": 100}'
+    await setup_integration(hass, entry)
+    coordinator = entry.runtime_data
+
+    # watched endpoints use their interval as cache time
+    assert coordinator.cache.ttl("/ivp/meters/readings") == 15  # noqa: PLR2004
+    assert coordinator.cache.ttl("/api/v1/production/inverters") == 450  # noqa: PLR2004
+
+    # first endpoint is read right away, second spread to half its interval
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    mock_envoy.request.assert_any_call("/ivp/meters/readings", None, None)
+    assert coordinator.cache.get("/ivp/meters/readings").data == {"wattsNow": 100}
+
+    mock_envoy.request.reset_mock()
+    freezer.tick(10)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    mock_envoy.request.assert_called_once_with("/ivp/meters/readings", None, None)
+
+    mock_envoy.request.reset_mock()
+    freezer.tick(140)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    mock_envoy.request.assert_any_call("/api/v1/production/inverters", None, None)
+
+    # failing polls are retried at next interval
+    mock_envoy.request.reset_mock()
+    mock_envoy.request.side_effect = EnvoyError("Test")
+    freezer.tick(10)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    mock_envoy.request.assert_called_once_with("/ivp/meters/readings", None, None)
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    mock_envoy.request.reset_mock()
+    freezer.tick(10)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    mock_envoy.request.assert_not_called()
+
+
+async def test_coordinator_probe_and_full_update(
+    hass: HomeAssistant,
+    config: dict[str, str],
+    mock_envoy: AsyncMock,
+) -> None:
+    """Test setup only probes envoy unless full update option is set."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="45a36e55aaddb2007c5f6602e0c38e72",
+        title="Envoy 1234",
+        unique_id=f"{DOMAIN}_for_1234",
+        data=config,
+    )
+    mock_envoy.request.return_value.read.return_value = b'{"wattsNow": 100}'
+    await setup_integration(hass, config_entry)
+    coordinator = config_entry.runtime_data
+    mock_envoy.update.assert_not_called()
+    mock_envoy.request.assert_called_once_with(PROBE_ENDPOINT)
+    assert coordinator.data == {PROBE_ENDPOINT: {"wattsNow": 100}}
+    assert coordinator.cache.get(PROBE_ENDPOINT).data == {"wattsNow": 100}
+
+    mock_envoy.data.raw = {"/ivp/ensemble/inventory": [{"type": "ENCHARGE"}]}
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_FULL_UPDATE: True}
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert config_entry.state is ConfigEntryState.LOADED
+    mock_envoy.update.assert_called_once_with()
+    coordinator = config_entry.runtime_data
+    assert coordinator.cache.get("/ivp/ensemble/inventory").data == [
+        {"type": "ENCHARGE"}
+    ]
+
+    # failing full update only leaves the cache empty
+    mock_envoy.update.side_effect = EnvoyError("Test")
+    await hass.config_entries.async_reload(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert config_entry.state is ConfigEntryState.LOADED
+    assert "/ivp/ensemble/inventory" not in config_entry.runtime_data.cache
+
+
+async def test_coordinator_probe_status_error(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    mock_envoy: AsyncMock,
+) -> None:
+    """Test setup retries if probe request returns server error status."""
+    mock_envoy.request.return_value.status = 500
+    await setup_integration(
+        hass, config_entry, expected_state=ConfigEntryState.SETUP_RETRY
+    )
+
+
+async def test_coordinator_probe_not_found(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    mock_envoy: AsyncMock,
+) -> None:
+    """Test envoy not serving the probe endpoint is set up without caching it."""
+    mock_envoy.request.return_value.status = 404
+    await setup_integration(hass, config_entry)
+    coordinator = config_entry.runtime_data
+    assert coordinator.data == {PROBE_ENDPOINT: None}
+    assert PROBE_ENDPOINT not in coordinator.cache
+
+
+async def test_coordinator_reauthenticate(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    mock_envoy: AsyncMock,
+) -> None:
+    """Test request re-authentication only runs envoy setup and authentication."""
+    await setup_integration(hass, config_entry)
+    coordinator = config_entry.runtime_data
+    mock_envoy.reset_mock()
+
+    response = mock_envoy.request.return_value
+    mock_envoy.request.side_effect = [EnvoyAuthenticationRequired("expired"), response]
+    assert (
+        await coordinator.async_request("/ivp/meters") == "Testing request \nreplies."
+    )
+    mock_envoy.setup.assert_called_once_with()
+    mock_envoy.authenticate.assert_called_once()
+    mock_envoy.update.assert_not_called()
+    # only the original request and its retry, no probe request
+    assert mock_envoy.request.call_count == 2  # noqa: PLR2004
+
+    # failing re-authentication is raised to the caller
+    mock_envoy.request.side_effect = EnvoyAuthenticationRequired("expired")
+    mock_envoy.authenticate.side_effect = EnvoyAuthenticationError("Test")
+    with pytest.raises(EnvoyAuthenticationError):
+        await coordinator.async_request("/ivp/meters")
+
+
+# simulated envoy round trip time and number of requests in a pyenphase update
+ENVOY_LATENCY = 0.02
+ENVOY_UPDATE_REQUESTS = 7
+
+
+async def test_coordinator_reauthenticate_benchmark(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    mock_envoy: AsyncMock,
+) -> None:
+    """Benchmark time to first successful request after token expiry."""
+    await setup_integration(hass, config_entry)
+    coordinator = config_entry.runtime_data
+
+    async def envoy_call(*args: Any, **kwargs: Any) -> None:
+        await asyncio.sleep(ENVOY_LATENCY)
+
+    async def envoy_update() -> Any:
+        for _ in range(ENVOY_UPDATE_REQUESTS):
+            await asyncio.sleep(ENVOY_LATENCY)
+        return mock_envoy.data
+
+    mock_envoy.setup.side_effect = envoy_call
+    mock_envoy.authenticate.side_effect = envoy_call
+    mock_envoy.update.side_effect = envoy_update
+
+    async def full_reauthenticate() -> None:
+        """Re-authenticate followed by full data update, the previous path."""
+        await reauthenticate()
+        await coordinator.async_update_all()
+
+    async def time_to_first_request() -> float:
+        mock_envoy.request.side_effect = [
+            EnvoyAuthenticationRequired("expired"),
+            mock_envoy.request.return_value,
+        ]
+        start = time.perf_counter()
+        await coordinator.async_request("/ivp/meters")
+        return time.perf_counter() - start
+
+    reauthenticate = coordinator.try_reauthenticate
+    lightweight = await time_to_first_request()
+    with patch.object(coordinator, "try_reauthenticate", full_reauthenticate):
+        full = await time_to_first_request()
+    assert lightweight < full, f"re-auth: {lightweight:.3f}s, with update {full:.3f}s"
+
+
+async def test_coordinator_reauthenticate_once(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    mock_envoy: AsyncMock,
+) -> None:
+    """Test concurrent requests failing authentication re-authenticate once."""
+    await setup_integration(hass, config_entry)
+    coordinator = config_entry.runtime_data
+    mock_envoy.reset_mock()
+
+    # envoy stand-in rejecting requests until authenticated again
+    response = mock_envoy.request.return_value
+    authenticated = False
+
+    async def envoy_authenticate(*args: Any, **kwargs: Any) -> None:
+        nonlocal authenticated
+        await asyncio.sleep(ENVOY_LATENCY)
+        authenticated = True
+
+    async def envoy_request(*args: Any, **kwargs: Any) -> Any:
+        await asyncio.sleep(0)
+        if not authenticated:
+            msg = "expired"
+            raise EnvoyAuthenticationRequired(msg)
+        return response
+
+    mock_envoy.authenticate.side_effect = envoy_authenticate
+    mock_envoy.request.side_effect = envoy_request
+
+    burst = 10
+    replies = await asyncio.gather(
+        *(coordinator.async_request(f"/endpoint/{i}") for i in range(burst))
+    )
+    assert replies == ["Testing request \nreplies."] * burst
+    mock_envoy.setup.assert_called_once_with()
+    mock_envoy.authenticate.assert_called_once()
+
+    # a request rejected after re-authentication completed only retries
+    generation = coordinator._auth_generation  # noqa: SLF001
+    await coordinator.async_reauthenticate(generation - 1)
+    mock_envoy.authenticate.assert_called_once()
+
+
+async def test_coordinator_cache_size(
+    hass: HomeAssistant,
+    config: dict[str, str],
+    mock_envoy: AsyncMock,
+) -> None:
+    """Test cache evicts least recently used replies when exceeding its size."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="45a36e55aaddb2007c5f6602e0c38e72",
+        title="Envoy 1234",
+        unique_id=f"{DOMAIN}_for_1234",
+        data=config,
+        options={CONF_CACHE_SIZE: 1},
+    )
+    await setup_integration(hass, config_entry)
+    cache = config_entry.runtime_data.cache
+    cache.clear()
+    assert cache.max_size == 1024  # noqa: PLR2004
+
+    cache.set("/first", "x" * 400)
+    cache.set("/second", "x" * 400)
+    # using first makes second the least recently used
+    assert cache.get("/first") is not None
+    cache.set("/third", "x" * 400)
+    assert "/first" in cache
+    assert "/second" not in cache
+    assert "/third" in cache
+    assert cache.occupancy == {
+        "entries": 2,
+        "size": 800,
+        "max_size": 1024,
+        "evictions": 1,
+        "generation": cache.generation,
+        "failures": 0,
+    }
+
+    # replies larger than the cache are not kept
+    cache.set("/first", "x" * 2000)
+    assert "/first" not in cache
+    assert cache.occupancy["size"] == 400  # noqa: PLR2004
+
+
+async def test_coordinator_cache_generations(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    mock_envoy: AsyncMock,
+) -> None:
+    """Test full update replies are stored as one cache generation."""
+    await setup_integration(hass, config_entry)
+    coordinator = config_entry.runtime_data
+    cache = coordinator.cache
+    probe = cache.get(PROBE_ENDPOINT)
+    assert probe is not None
+
+    raw = {"/ivp/meters": [{"eid": 1}], "/ivp/meters/readings": [{"eid": 1}]}
+    mock_envoy.update.return_value.raw = raw
+    await coordinator.async_update_all()
+    meters = cache.get("/ivp/meters")
+    readings = cache.get("/ivp/meters/readings")
+    assert meters is not None
+    assert readings is not None
+    assert meters.generation == readings.generation == cache.generation
+    assert meters.generation > probe.generation
+    assert meters.as_metadata(from_cache=True)["generation"] == cache.generation
+
+    # pyenphase replacing or changing its data does not affect the cache
+    raw.clear()
+    assert "/ivp/meters" in cache
+
+
+async def test_coordinator_cache_storage(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    mock_envoy: AsyncMock,
+    freezer: FrozenDateTimeFactory,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test cache is restored at setup and saved with a delay."""
+    key = f"{DOMAIN}.{config_entry.entry_id}.cache"
+    fetched = dt_util.utcnow().timestamp() - 30
+    hass_storage[key] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": key,
+        "data": {"entries": [["/ivp/meters", fetched, 7, [{"eid": 1}]]]},
+    }
+    await setup_integration(hass, config_entry)
+    coordinator = config_entry.runtime_data
+    entry = coordinator.cache.get("/ivp/meters")
+    assert entry is not None
+    assert entry.data == [{"eid": 1}]
+    assert entry.fetched == fetched
+    assert entry.generation == 7  # noqa: PLR2004
+    assert coordinator.cache.generation > entry.generation
+
+    # changes are saved after the delay
+    coordinator.cache.set("/ivp/meters/readings", [{"eid": 2}])
+    assert hass_storage[key]["data"]["entries"] == [
+        ["/ivp/meters", fetched, 7, [{"eid": 1}]]
+    ]
+    freezer.tick(CACHE_SAVE_DELAY)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    endpoints = [stored[0] for stored in hass_storage[key]["data"]["entries"]]
+    assert endpoints == [PROBE_ENDPOINT, "/ivp/meters", "/ivp/meters/readings"]
+
+    # continuous changes do not postpone the save beyond the delay
+    for second in range(CACHE_SAVE_DELAY):
+        coordinator.cache.set("/stream/meter", {"second": second})
+        freezer.tick(1)
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+    stored = {entry[0]: entry[3] for entry in hass_storage[key]["data"]["entries"]}
+    assert stored["/stream/meter"] == {"second": CACHE_SAVE_DELAY - 1}
+
+    # cache is saved at unload and storage removed with the entry
+    coordinator.cache.clear()
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    assert hass_storage[key]["data"]["entries"] == []
+    await hass.config_entries.async_remove(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert key not in hass_storage
+
+
+async def test_coordinator_request_priority(
+    hass: HomeAssistant,
+    config: dict[str, str],
+    mock_envoy: AsyncMock,
+) -> None:
+    """Test waiting requests are sent in order of priority."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="45a36e55aaddb2007c5f6602e0c38e72",
+        title="Envoy 1234",
+        unique_id=f"{DOMAIN}_for_1234",
+        data=config,
+        options={CONF_MAX_CONCURRENT_REQUESTS: 1},
+    )
+    await setup_integration(hass, config_entry)
+    coordinator = config_entry.runtime_data
+    scheduler = coordinator.scheduler
+    assert scheduler.max_concurrent == 1
+
+    # first request blocks the envoy until released
+    response = mock_envoy.request.return_value
+    release = asyncio.Event()
+    sent: list[str] = []
+
+    async def envoy_request(endpoint: str, *args: Any) -> Any:
+        sent.append(endpoint)
+        if endpoint == "/blocking":
+            await release.wait()
+        return response
+
+    mock_envoy.request.side_effect = envoy_request
+    tasks = [asyncio.create_task(coordinator.async_request("/blocking"))]
+    await asyncio.sleep(0)
+    tasks += [
+        asyncio.create_task(
+            coordinator.async_request("/watch", priority=RequestPriority.BACKGROUND)
+        ),
+        asyncio.create_task(coordinator.async_request("/read")),
+        asyncio.create_task(coordinator.async_request("/send", {"data": 1})),
+        asyncio.create_task(coordinator.async_request("/cancelled")),
+    ]
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert scheduler.active == 1
+    assert scheduler.queue_depth == 4  # noqa: PLR2004
+
+    # cancelled waiting request is skipped
+    tasks.pop().cancel()
+    await asyncio.sleep(0)
+    assert scheduler.queue_depth == 3  # noqa: PLR2004
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert sent == ["/blocking", "/send", "/read", "/watch"]
+    occupancy = scheduler.occupancy
+    assert occupancy["active"] == 0
+    assert occupancy["queue_depth"] == 0
+    assert occupancy["requests"] == 5  # noqa: PLR2004
+    assert occupancy["queued"] == 4  # noqa: PLR2004
+    assert occupancy["wait_time_max"] >= occupancy["wait_time_avg"]
+
+
+async def test_coordinator_shared_read_priority(
+    hass: HomeAssistant,
+    config: dict[str, str],
+    mock_envoy: AsyncMock,
+) -> None:
+    """Test a waiting shared read is moved up by a higher priority caller."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="45a36e55aaddb2007c5f6602e0c38e72",
+        title="Envoy 1234",
+        unique_id=f"{DOMAIN}_for_1234",
+        data=config,
+        options={CONF_MAX_CONCURRENT_REQUESTS: 1},
+    )
+    await setup_integration(hass, config_entry)
+    coordinator = config_entry.runtime_data
+    scheduler = coordinator.scheduler
+
+    response = mock_envoy.request.return_value
+    release = asyncio.Event()
+    sent: list[str] = []
+
+    async def envoy_request(endpoint: str, *args: Any) -> Any:
+        sent.append(endpoint)
+        if endpoint == "/blocking":
+            await release.wait()
+        return response
+
+    mock_envoy.request.side_effect = envoy_request
+    tasks = [asyncio.create_task(coordinator.async_request("/blocking"))]
+    await asyncio.sleep(0)
+    tasks += [
+        asyncio.create_task(coordinator.async_request("/read")),
+        asyncio.create_task(
+            coordinator.async_read("/watch", priority=RequestPriority.BACKGROUND)
+        ),
+    ]
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert scheduler.queue_depth == 2  # noqa: PLR2004
+
+    # send priority caller joins the waiting background read
+    tasks.append(
+        asyncio.create_task(
+            coordinator.async_read("/watch", priority=RequestPriority.SEND)
+        )
+    )
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert scheduler.queue_depth == 2  # noqa: PLR2004
+
+    release.set()
+    results = await asyncio.gather(*tasks)
+    assert sent == ["/blocking", "/watch", "/read"]
+    assert results[2][1] == results[3][1] == 2  # noqa: PLR2004
+    assert scheduler.occupancy["queue_depth"] == 0
+
+
+async def test_coordinator_connection_pool(
+    hass: HomeAssistant,
+    config: dict[str, str],
+    mock_envoy: AsyncMock,
+) -> None:
+    """Test dedicated connection pool follows concurrency limit and is closed."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="45a36e55aaddb2007c5f6602e0c38e72",
+        title="Envoy 1234",
+        unique_id=f"{DOMAIN}_for_1234",
+        data=config,
+        options={CONF_MAX_CONCURRENT_REQUESTS: 4},
+    )
+    await setup_integration(hass, config_entry)
+    pool = config_entry.runtime_data.pool
+    # 1 connection more for unscheduled communication check and authentication
+    assert pool.connector.limit == 5  # noqa: PLR2004
+    assert pool.connector.limit_per_host == 5  # noqa: PLR2004
+    assert not pool.session.closed
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert pool.session.closed
+
+
+async def test_coordinator_dns_cache(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    mock_envoy: AsyncMock,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test resolved envoy address is reused until expired or connection fails."""
+    await setup_integration(hass, config_entry)
+    coordinator = config_entry.runtime_data
+    resolver = coordinator.pool.resolver
+    address = {
+        "hostname": "envoy.local",
+        "host": "192.168.1.10",
+        "port": 443,
+        "family": socket.AF_INET,
+        "proto": 0,
+        "flags": 0,
+    }
+    with patch.object(
+        resolver._resolver,  # noqa: SLF001
+        "resolve",
+        return_value=[address],
+    ) as mock_resolve:
+        assert await resolver.resolve("envoy.local", 443) == [address]
+        assert await resolver.resolve("envoy.local", 443) == [address]
+        mock_resolve.assert_called_once()
+
+        freezer.tick(DNS_CACHE_TTL)
+        await resolver.resolve("envoy.local", 443)
+        assert mock_resolve.call_count == 2  # noqa: PLR2004
+
+        # connection failure forgets the address, envoy may have moved
+        coordinator.retry_policy.max_attempts = 1
+        mock_envoy.request.side_effect = ClientError("Test")
+        with pytest.raises(ClientError):
+            await coordinator.async_request("/ivp/meters")
+        await resolver.resolve("envoy.local", 443)
+        assert mock_resolve.call_count == 3  # noqa: PLR2004
+
+    assert resolver.diagnostics == {
+        "pinned": ["192.168.1.10"],
+        "lookups": 3,
+        "cache_hits": 1,
+        "invalidations": 1,
+    }
+
+
+async def test_coordinator_dns_cache_mdns(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test .local envoy name is resolved with mDNS when DNS can not resolve it."""
+    await setup_integration(hass, config_entry)
+    resolver = config_entry.runtime_data.pool.resolver
+    address = {
+        "hostname": "envoy.local",
+        "host": "192.168.1.10",
+        "port": 443,
+        "family": socket.AF_INET,
+        "proto": 0,
+        "flags": 0,
+    }
+    with (
+        patch.object(AsyncResolver, "resolve", side_effect=OSError("No DNS")),
+        patch.object(
+            resolver._resolver,  # noqa: SLF001
+            "_resolve_mdns",
+            return_value=[address],
+        ) as mock_mdns,
+    ):
+        assert await resolver.resolve("envoy.local", 443) == [address]
+        assert await resolver.resolve("envoy.local", 443) == [address]
+    mock_mdns.assert_called_once()
+    assert resolver.diagnostics["pinned"] == ["192.168.1.10"]
+
+
+async def test_coordinator_meter_stream(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    mock_envoy: AsyncMock,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test meter stream readings are forwarded as throttled events."""
+    await setup_integration(hass, config_entry)
+    coordinator = config_entry.runtime_data
+    events = async_capture_events(hass, EVENT_METER_STREAM)
+    readings = [
+        {"production": {"ph-a": {"p": 100.0}}},
+        {"production": {"ph-a": {"p": 110.0}}},
+    ]
+
+    async def stream_content() -> Any:
+        yield b"data: " + orjson.dumps(readings[0]) + b"\n"
+        yield b"\n"
+        yield b"data: {invalid\n"
+        yield b"data: [1, 2]\n"
+        yield b"data: " + orjson.dumps(readings[1]) + b"\n"
+        # reader error ends the stream without stopping the reconnects
+        raise ValueError("Line is too long")  # noqa: EM101, TRY003
+
+    with (
+        patch.object(coordinator.pool.session, "get") as mock_get,
+        patch(
+            "custom_components.enphase_envoy_raw_data.stream.backoff_delay",
+            return_value=3600,
+        ),
+    ):
+        mock_get.return_value.__aenter__.return_value = MagicMock(
+            status=200, content=stream_content()
+        )
+        coordinator.async_start_stream(60)
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+    stream = coordinator.meter_stream
+    assert stream
+    assert stream.latest == readings[1]
+    # readings within the interval only replace the latest reading
+    assert len(events) == 1
+    assert events[0].data == {
+        "config_entry_id": config_entry.entry_id,
+        "data": readings[0],
+    }
+    entry = coordinator.cache.get(STREAM_ENDPOINT, 60)
+    assert entry
+    assert entry.data == readings[0]
+    # stream ended and waits to reconnect
+    assert "unexpected meter stream error" in caplog.text
+    assert stream.diagnostics == {
+        "interval": 60,
+        "bucket": None,
+        "connected": False,
+        "connects": 1,
+        "disconnects": 1,
+        "samples": 2,
+        "events": 1,
+        "unauthorized": False,
+    }
+    coordinator.async_stop_stream()
+
+
+async def test_coordinator_meter_stream_unauthorized(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    mock_envoy: AsyncMock,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test meter stream stops when still unauthorized after re-authentication."""
+    await setup_integration(hass, config_entry)
+    coordinator = config_entry.runtime_data
+
+    with (
+        patch.object(coordinator.pool.session, "get") as mock_get,
+        patch.object(coordinator, "async_reauthenticate") as mock_reauthenticate,
+        patch(
+            "custom_components.enphase_envoy_raw_data.stream.backoff_delay",
+            return_value=0,
+        ),
+    ):
+        mock_get.return_value.__aenter__.return_value = MagicMock(status=401)
+        coordinator.async_start_stream(60)
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+    stream = coordinator.meter_stream
+    assert stream
+    assert stream.unauthorized
+    mock_reauthenticate.assert_called_once()
+    assert mock_get.call_count == 2  # noqa: PLR2004
+    assert "meter stream stopped, not authorized with status 401" in caplog.text
+    coordinator.async_stop_stream()
+
+
+def test_meter_stream_aggregation() -> None:
+    """Test meter readings are aggregated into bucket summaries."""
+    aggregator = MeterAggregator(60)
+    start = 1700000040.0
+
+    def reading(power: float, voltage: float) -> dict[str, Any]:
+        return {"production": {"ph-a": {"p": power, "v": voltage}}}
+
+    assert aggregator.add(reading(100.0, 230.0), start) is None
+    assert aggregator.add(reading(200.0, 232.0), start + 30) is None
+    # first reading of next bucket completes the bucket
+    assert aggregator.add(reading(300.0, 231.0), start + 60) == {
+        "start": "2023-11-14T22:14:00+00:00",
+        "end": "2023-11-14T22:15:00+00:00",
+        "samples": 2,
+        "data": {
+            "production": {
+                "ph-a": {
+                    "p": {
+                        "min": 100.0,
+                        "max": 200.0,
+                        "mean": 150.0,
+                        "last": 200.0,
+                        "energy": 1.25,
+                    },
+                    "v": {"min": 230.0, "max": 232.0, "mean": 231.0, "last": 232.0},
+                }
+            }
+        },
+    }
+    # energy is not integrated over a gap in the readings
+    summary = aggregator.add(reading(300.0, 231.0), start + 200)
+    assert summary
+    assert summary["samples"] == 1
+    assert summary["data"]["production"]["ph-a"]["p"]["energy"] == 2.0833  # noqa: PLR2004
+    assert aggregator.add(reading(300.0, 231.0), start + 230) is None
+    assert aggregator.buckets == 2  # noqa: PLR2004
+
+
+async def test_coordinator_adaptive_concurrency(
+    hass: HomeAssistant,
+    config: dict[str, str],
+    mock_envoy: AsyncMock,
+) -> None:
+    """Test concurrency limit adapts to envoy latency and failures."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="45a36e55aaddb2007c5f6602e0c38e72",
+        title="Envoy 1234",
+        unique_id=f"{DOMAIN}_for_1234",
+        data=config,
+        options={CONF_MAX_CONCURRENT_REQUESTS: 4, CONF_RETRY_ATTEMPTS: 1},
+    )
+    await setup_integration(hass, config_entry)
+    coordinator = config_entry.runtime_data
+    scheduler = coordinator.scheduler
+    assert scheduler.limit == 4  # noqa: PLR2004
+
+    # latency rising well above endpoint average halves the limit
+    scheduler.record("/ivp/meters/readings", 0.0)
+    scheduler.record("/ivp/meters/readings", 1.0)
+    assert scheduler.limit == 2  # noqa: PLR2004
+    assert scheduler.decreases == 1
+
+    # slow endpoints are compared to their own average
+    scheduler.record("/inventory.json", 5.0)
+    assert scheduler.limit == 2.5  # noqa: PLR2004
+
+    # failed request halves the limit, not below 1
+    mock_envoy.request.side_effect = ClientError("Test")
+    for endpoint in ("/fail", "/other"):
+        with pytest.raises(ClientError):
+            await coordinator.async_request(endpoint)
+    assert scheduler.limit == 1
+    assert scheduler.occupancy["decreases"] == 3  # noqa: PLR2004
+
+    # normal requests grow the limit back to the maximum
+    mock_envoy.request.side_effect = None
+    for _ in range(10):
+        await coordinator.async_request("/ivp/meters/readings")
+    assert scheduler.limit == 4  # noqa: PLR2004
@@ -1,25 +1,54 @@
 """Test the Enphase Envoy services."""
 
+import asyncio
+import time
+from typing import Any
 from unittest.mock import AsyncMock, patch
 
+import orjson
 import pytest
+import voluptuous as vol
+from aiohttp import ClientError
+from freezegun.api import FrozenDateTimeFactory
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.util import dt as dt_util
 from pyenphase import EnvoyAuthenticationRequired, EnvoyError
 from pyenphase.const import URL_TARIFF
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 from syrupy.assertion import SnapshotAssertion
 
-from custom_components.enphase_envoy_raw_data.const import DOMAIN
+from custom_components.enphase_envoy_raw_data.const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    DEFAULT_RETRY_ATTEMPTS,
+    DOMAIN,
+    RETRY_BUDGET_WINDOW,
+    STREAM_ENDPOINT,
+)
+from custom_components.enphase_envoy_raw_data.history import EndpointHistory
+from custom_components.enphase_envoy_raw_data.inverters import analyze_inverters
+from custom_components.enphase_envoy_raw_data.retry import EnvoyRetryPolicy
 from custom_components.enphase_envoy_raw_data.services import (
     ATTR_CONFIG_ENTRY_ID,
+    ATTR_CONFIG_ENTRY_IDS,
     ATTR_DATA,
+    ATTR_DURATION,
     ATTR_ENDPOINT,
+    ATTR_ENDPOINTS,
     ATTR_FROM_CACHE,
+    ATTR_MAX_AGE,
+    ATTR_METADATA,
     ATTR_METHOD,
+    ATTR_PATHS,
     ATTR_RISK_ACKNOWLEDGED,
+    ATTR_SERIAL,
+    ATTR_STALE_AFTER,
+    ATTR_STALE_WHILE_REVALIDATE,
+    ATTR_TIMEOUT,
     ATTR_VALIDATE_MODE,
+    ATTR_ZSCORE,
 )
 
 from . import setup_integration
@@ -35,6 +64,8 @@ async def test_has_services(
     await setup_integration(hass, config_entry)
     assert config_entry.state is ConfigEntryState.LOADED
     assert hass.services.has_service(DOMAIN, "read_data")
+    assert hass.services.has_service(DOMAIN, "read_many")
+    assert hass.services.has_service(DOMAIN, "read_envoys")
     assert hass.services.has_service(DOMAIN, "send_data")
     assert snapshot == list(hass.services.async_services_for_domain(DOMAIN).keys())
 
@@ -97,8 +128,10 @@ async def test_service_read_data(
     assert result
     assert result["/tariff"] == {"tariff": {"currency": {"code": "EUR"}}}
 
+    assert result[ATTR_METADATA][ATTR_FROM_CACHE] is False
+
     test_pattern = {"tariff": {"currency": {"code": "USD"}}}
-    mock_envoy.data.raw = {URL_TARIFF: test_pattern}
+    config_entry.runtime_data.cache.set(URL_TARIFF, test_pattern)
     result = await hass.services.async_call(
         DOMAIN,
         "read_data",
@@ -112,6 +145,310 @@ async def test_service_read_data(
     )
     assert result
     assert result[URL_TARIFF] == {"tariff": {"currency": {"code": "USD"}}}
+    assert result[ATTR_METADATA][ATTR_FROM_CACHE] is True
+
+
+async def test_service_read_data_max_age(
+    hass: HomeAssistant,
+    mock_envoy: AsyncMock,
+    config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test read_data service using cached data up to max_age."""
+    await setup_integration(hass, config_entry)
+    assert config_entry.state is ConfigEntryState.LOADED
+
+    mock_envoy.request.reset_mock()
+    mock_envoy.request.return_value.read.return_value = b'{"wattsNow": 100}'
+    service_data = {
+        ATTR_CONFIG_ENTRY_ID: config_entry.entry_id,
+        ATTR_ENDPOINT: "/api/v1/production/inverters",
+        ATTR_MAX_AGE: 30,
+    }
+    result = await hass.services.async_call(
+        DOMAIN, "read_data", service_data, blocking=True, return_response=True
+    )
+    assert result
+    assert result["/api/v1/production/inverters"] == {"wattsNow": 100}
+    assert result[ATTR_METADATA][ATTR_FROM_CACHE] is False
+    mock_envoy.request.reset_mock()
+
+    # within max_age the cached reply is returned with its age
+    mock_envoy.request.return_value.read.return_value = b'{"wattsNow": 200}'
+    elapsed = 20
+    freezer.tick(elapsed)
+    result = await hass.services.async_call(
+        DOMAIN, "read_data", service_data, blocking=True, return_response=True
+    )
+    assert result
+    assert result["/api/v1/production/inverters"] == {"wattsNow": 100}
+    assert result[ATTR_METADATA][ATTR_FROM_CACHE] is True
+    assert result[ATTR_METADATA]["age"] == elapsed
+    mock_envoy.request.assert_not_called()
+
+    # beyond max_age the envoy is used, even if endpoint ttl for from_cache is longer
+    freezer.tick(elapsed)
+    result = await hass.services.async_call(
+        DOMAIN,
+        "read_data",
+        service_data | {ATTR_MAX_AGE: 30, ATTR_FROM_CACHE: True},
+        blocking=True,
+        return_response=True,
+    )
+    assert result
+    assert result["/api/v1/production/inverters"] == {"wattsNow": 200}
+    assert result[ATTR_METADATA][ATTR_FROM_CACHE] is False
+    assert result[ATTR_METADATA]["age"] == 0
+    mock_envoy.request.assert_called_once()
+
+
+async def test_service_read_data_stale_while_revalidate(
+    hass: HomeAssistant,
+    mock_envoy: AsyncMock,
+    config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test read_data service returning stale data and refreshing it."""
+    await setup_integration(hass, config_entry)
+    assert config_entry.state is ConfigEntryState.LOADED
+
+    endpoint = "/ivp/meters/readings"
+    service_data = {
+        ATTR_CONFIG_ENTRY_ID: config_entry.entry_id,
+        ATTR_ENDPOINT: endpoint,
+        ATTR_STALE_WHILE_REVALIDATE: True,
+    }
+    mock_envoy.request.reset_mock()
+    mock_envoy.request.return_value.read.return_value = b'[{"eid": 100}]'
+
+    # not in cache, read from envoy
+    result = await hass.services.async_call(
+        DOMAIN, "read_data", service_data, blocking=True, return_response=True
+    )
+    assert result
+    assert result[endpoint] == [{"eid": 100}]
+    assert result[ATTR_METADATA][ATTR_FROM_CACHE] is False
+    mock_envoy.request.assert_called_once()
+    mock_envoy.request.reset_mock()
+
+    # past cache time, stale data is returned and refreshed in the background
+    mock_envoy.request.return_value.read.return_value = b'[{"eid": 200}]'
+    elapsed = 60
+    freezer.tick(elapsed)
+    result = await hass.services.async_call(
+        DOMAIN, "read_data", service_data, blocking=True, return_response=True
+    )
+    assert result
+    assert result[endpoint] == [{"eid": 100}]
+    assert result[ATTR_METADATA][ATTR_FROM_CACHE] is True
+    assert result[ATTR_METADATA]["stale"] is True
+    assert result[ATTR_METADATA]["age"] == elapsed
+    await hass.async_block_till_done(wait_background_tasks=True)
+    mock_envoy.request.assert_called_once()
+    mock_envoy.request.reset_mock()
+
+    # refreshed data is fresh
+    result = await hass.services.async_call(
+        DOMAIN, "read_data", service_data, blocking=True, return_response=True
+    )
+    assert result
+    assert result[endpoint] == [{"eid": 200}]
+    assert result[ATTR_METADATA][ATTR_FROM_CACHE] is True
+    assert "stale" not in result[ATTR_METADATA]
+    mock_envoy.request.assert_not_called()
+
+    # failing refresh keeps the stale data
+    mock_envoy.request.side_effect = EnvoyError("Test")
+    freezer.tick(elapsed)
+    for _ in range(2):
+        result = await hass.services.async_call(
+            DOMAIN, "read_data", service_data, blocking=True, return_response=True
+        )
+        assert result
+        assert result[endpoint] == [{"eid": 200}]
+        assert result[ATTR_METADATA]["stale"] is True
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+
+async def test_service_read_data_coalesced(
+    hass: HomeAssistant,
+    mock_envoy: AsyncMock,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test concurrent read_data calls for same endpoint share one request."""
+    await setup_integration(hass, config_entry)
+    assert config_entry.state is ConfigEntryState.LOADED
+
+    mock_envoy.request.reset_mock()
+    reply = mock_envoy.request.return_value
+    reply.read.return_value = b'{"wattsNow": 100}'
+    release = asyncio.Event()
+
+    async def slow_request(*args: Any) -> Any:
+        await release.wait()
+        return reply
+
+    mock_envoy.request.side_effect = slow_request
+    calls = [
+        asyncio.create_task(
+            hass.services.async_call(
+                DOMAIN,
+                "read_data",
+                {
+                    ATTR_CONFIG_ENTRY_ID: config_entry.entry_id,
+                    ATTR_ENDPOINT: "/api/v1/production",
+                },
+                blocking=True,
+                return_response=True,
+            )
+        )
+        for _ in range(3)
+    ]
+    # let all calls reach the pending request
+    for _ in range(10):
+        await asyncio.sleep(0)
+    in_flight = config_entry.runtime_data._in_flight  # noqa: SLF001
+    assert in_flight["/api/v1/production"].callers == len(calls)
+    release.set()
+    results = await asyncio.gather(*calls)
+
+    mock_envoy.request.assert_called_once()
+    for result in results:
+        assert result["/api/v1/production"] == {"wattsNow": 100}
+        assert result[ATTR_METADATA]["coalesced_callers"] == len(calls)
+
+
+async def test_service_read_many(
+    hass: HomeAssistant,
+    mock_envoy: AsyncMock,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test read_many service with a failing endpoint."""
+    await setup_integration(hass, config_entry)
+    assert config_entry.state is ConfigEntryState.LOADED
+
+    mock_envoy.request.reset_mock()
+    reply = mock_envoy.request.return_value
+    reply.read.return_value = b'{"wattsNow": 100}'
+
+    async def request(endpoint: str, *args: Any) -> Any:
+        if endpoint == "/bad":
+            msg = "cannot_connect"
+            raise EnvoyError(msg)
+        return reply
+
+    mock_envoy.request.side_effect = request
+    config_entry.runtime_data.cache.set(URL_TARIFF, {"tariff": {}})
+    result = await hass.services.async_call(
+        DOMAIN,
+        "read_many",
+        {
+            ATTR_CONFIG_ENTRY_ID: config_entry.entry_id,
+            ATTR_ENDPOINTS: ["/ivp/meters/readings", "/bad", URL_TARIFF, "/bad"],
+            ATTR_FROM_CACHE: True,
+        },
+        blocking=True,
+        return_response=True,
+    )
+    assert result
+    assert list(result) == ["/ivp/meters/readings", "/bad", URL_TARIFF]
+    assert result["/ivp/meters/readings"]["status"] == "ok"
+    assert result["/ivp/meters/readings"][ATTR_DATA] == {"wattsNow": 100}
+    assert result["/ivp/meters/readings"][ATTR_METADATA][ATTR_FROM_CACHE] is False
+    assert result["/bad"]["status"] == "error"
+    assert "Error communicating with Envoy API on" in result["/bad"]["error"]
+    assert result[URL_TARIFF]["status"] == "ok"
+    assert result[URL_TARIFF][ATTR_DATA] == {"tariff": {}}
+    assert result[URL_TARIFF][ATTR_METADATA][ATTR_FROM_CACHE] is True
+    assert mock_envoy.request.call_count == 2  # noqa: PLR2004
+
+
+async def test_service_read_envoys(
+    hass: HomeAssistant,
+    mock_envoy: AsyncMock,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test read_envoys service for all and specified envoys."""
+    await setup_integration(hass, config_entry)
+    assert config_entry.state is ConfigEntryState.LOADED
+
+    mock_envoy.request.return_value.read.return_value = b'{"wattsNow": 100}'
+    result = await hass.services.async_call(
+        DOMAIN,
+        "read_envoys",
+        {ATTR_ENDPOINT: "/api/v1/production"},
+        blocking=True,
+        return_response=True,
+    )
+    assert result
+    assert list(result) == ["1234"]
+    assert result["1234"][ATTR_CONFIG_ENTRY_ID] == config_entry.entry_id
+    assert result["1234"]["status"] == "ok"
+    assert result["1234"][ATTR_DATA] == {"wattsNow": 100}
+
+    mock_envoy.request.side_effect = EnvoyError("cannot_connect")
+    result = await hass.services.async_call(
+        DOMAIN,
+        "read_envoys",
+        {
+            ATTR_CONFIG_ENTRY_IDS: [config_entry.entry_id],
+            ATTR_ENDPOINT: "/api/v1/production",
+        },
+        blocking=True,
+        return_response=True,
+    )
+    assert result
+    assert result["1234"]["status"] == "error"
+    assert "Error communicating with Envoy API on" in result["1234"]["error"]
+
+    with pytest.raises(
+        ServiceValidationError,
+        match="No Enphase_Envoy_raw_data configuration entry found: 123456789",
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            "read_envoys",
+            {
+                ATTR_CONFIG_ENTRY_IDS: [config_entry.entry_id, "123456789"],
+                ATTR_ENDPOINT: "/api/v1/production",
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+    # loaded config entry of another integration
+    other_entry = MockConfigEntry(
+        domain="enphase_envoy", entry_id="987654321", state=ConfigEntryState.LOADED
+    )
+    other_entry.add_to_hass(hass)
+    with pytest.raises(
+        ServiceValidationError,
+        match="No Enphase_Envoy_raw_data configuration entry found: 987654321",
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            "read_envoys",
+            {
+                ATTR_CONFIG_ENTRY_IDS: [other_entry.entry_id],
+                ATTR_ENDPOINT: "/api/v1/production",
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+    # without loaded envoys
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    with pytest.raises(
+        ServiceValidationError,
+        match="No Enphase_Envoy_raw_data configuration entry found",
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            "read_envoys",
+            {ATTR_ENDPOINT: "/api/v1/production"},
+            blocking=True,
+            return_response=True,
+        )
 
 
 async def test_service_read_text_data(
@@ -184,6 +521,8 @@ async def test_service_read_data_exceptions(
         )
 
     mock_envoy.request.side_effect = None
+    # forget the cached authentication failure to send next request
+    config_entry.runtime_data.cache.clear_failures()
 
     mock_envoy.request.return_value.status = 300
 
@@ -199,7 +538,7 @@ async def test_service_read_data_exceptions(
             return_response=True,
         )
 
-    mock_envoy.data.raw = None
+    config_entry.runtime_data.data = None
     with pytest.raises(
         HomeAssistantError,
         match="Enphase_Envoy_raw_data is not yet initialized",
@@ -213,6 +552,663 @@ async def test_service_read_data_exceptions(
         )
 
 
+async def test_service_read_data_stream_endpoint(
+    hass: HomeAssistant,
+    mock_envoy: AsyncMock,
+    config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test read_data never requests the meter stream from the envoy."""
+    await setup_integration(hass, config_entry)
+    assert config_entry.state is ConfigEntryState.LOADED
+    mock_envoy.request.reset_mock()
+    service_data = {
+        ATTR_CONFIG_ENTRY_ID: config_entry.entry_id,
+        ATTR_ENDPOINT: STREAM_ENDPOINT,
+    }
+    with pytest.raises(ServiceValidationError, match="No meter stream readings"):
+        await hass.services.async_call(
+            DOMAIN, "read_data", service_data, blocking=True, return_response=True
+        )
+
+    # last stored reading is returned regardless of age
+    config_entry.runtime_data.cache.set(STREAM_ENDPOINT, {"production": {}})
+    freezer.tick(3600)
+    result = await hass.services.async_call(
+        DOMAIN,
+        "read_data",
+        service_data | {ATTR_FROM_CACHE: True},
+        blocking=True,
+        return_response=True,
+    )
+    assert result
+    assert result[STREAM_ENDPOINT] == {"production": {}}
+    assert result[ATTR_METADATA][ATTR_FROM_CACHE] is True
+    assert result[ATTR_METADATA]["age"] == 3600  # noqa: PLR2004
+    mock_envoy.request.assert_not_called()
+
+
+async def test_service_read_data_negative_cache(
+    hass: HomeAssistant,
+    mock_envoy: AsyncMock,
+    config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test read_data service failing fast for recently failed endpoints."""
+    await setup_integration(hass, config_entry)
+    assert config_entry.state is ConfigEntryState.LOADED
+
+    async def read_data(endpoint: str) -> None:
+        with pytest.raises(
+            HomeAssistantError, match="Error communicating with Envoy API on"
+        ):
+            await hass.services.async_call(
+                DOMAIN,
+                "read_data",
+                {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id, ATTR_ENDPOINT: endpoint},
+                blocking=True,
+                return_response=True,
+            )
+
+    # not found is remembered for 5 minutes
+    mock_envoy.request.reset_mock()
+    mock_envoy.request.return_value.status = 404
+    await read_data("/not_found")
+    await read_data("/not_found")
+    mock_envoy.request.assert_called_once_with("/not_found", None, None)
+
+    # other errors are not remembered
+    mock_envoy.request.reset_mock()
+    mock_envoy.request.return_value.status = 500
+    await read_data("/server_error")
+    await read_data("/server_error")
+    assert mock_envoy.request.call_count == 2  # noqa: PLR2004
+
+    # not authorized after re-authentication is remembered for 1 minute
+    mock_envoy.request.reset_mock()
+    mock_envoy.request.side_effect = EnvoyAuthenticationRequired("Test failure")
+    await read_data("/installer")
+    await read_data("/installer")
+    assert mock_envoy.request.call_count == 2  # noqa: PLR2004
+
+    # after expiry requests are send again
+    mock_envoy.request.reset_mock()
+    mock_envoy.request.side_effect = None
+    mock_envoy.request.return_value.status = 200
+    freezer.tick(60)
+    result = await hass.services.async_call(
+        DOMAIN,
+        "read_data",
+        {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id, ATTR_ENDPOINT: "/installer"},
+        blocking=True,
+        return_response=True,
+    )
+    assert result
+    assert result["/installer"] == "Testing request \nreplies."
+    await read_data("/not_found")
+    mock_envoy.request.assert_called_once()
+    assert config_entry.runtime_data.cache.occupancy["failures"] == 1
+
+
+async def test_service_read_data_circuit_breaker(
+    hass: HomeAssistant,
+    mock_envoy: AsyncMock,
+    config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test read_data service failing fast when envoy is not reachable."""
+    await setup_integration(hass, config_entry)
+    assert config_entry.state is ConfigEntryState.LOADED
+    breaker = config_entry.runtime_data.breaker
+    config_entry.runtime_data.cache.set("/ivp/meters", [{"eid": 1}])
+    service_data = {
+        ATTR_CONFIG_ENTRY_ID: config_entry.entry_id,
+        ATTR_ENDPOINT: "/ivp/meters",
+    }
+
+    # breaker opens after 3 consecutive reads failing after all retries
+    mock_envoy.request.reset_mock()
+    mock_envoy.request.side_effect = ClientError("Test")
+    with patch.object(EnvoyRetryPolicy, "delay", return_value=0):
+        for call in range(1, BREAKER_FAILURE_THRESHOLD + 1):
+            with pytest.raises(
+                HomeAssistantError, match="Error communicating with Envoy API on"
+            ):
+                await hass.services.async_call(
+                    DOMAIN,
+                    "read_data",
+                    service_data,
+                    blocking=True,
+                    return_response=True,
+                )
+            assert breaker.consecutive_failures == call
+    assert breaker.state == "open"
+    assert (
+        mock_envoy.request.call_count
+        == BREAKER_FAILURE_THRESHOLD * DEFAULT_RETRY_ATTEMPTS
+    )
+    mock_envoy.request.reset_mock()
+
+    with pytest.raises(HomeAssistantError, match="is not reachable"):
+        await hass.services.async_call(
+            DOMAIN, "read_data", service_data, blocking=True, return_response=True
+        )
+
+    # cached data of any age is used when caller accepts cached data
+    result = await hass.services.async_call(
+        DOMAIN,
+        "read_data",
+        service_data | {ATTR_MAX_AGE: 0},
+        blocking=True,
+        return_response=True,
+    )
+    assert result
+    assert result["/ivp/meters"] == [{"eid": 1}]
+    assert result[ATTR_METADATA][ATTR_FROM_CACHE] is True
+    assert result[ATTR_METADATA]["fallback"] == "envoy_unavailable"
+    mock_envoy.request.assert_not_called()
+
+    # after reset timeout a failing probe request opens the breaker again
+    freezer.tick(BREAKER_RESET_TIMEOUT)
+    with pytest.raises(
+        HomeAssistantError, match="Error communicating with Envoy API on"
+    ):
+        await hass.services.async_call(
+            DOMAIN, "read_data", service_data, blocking=True, return_response=True
+        )
+    mock_envoy.request.assert_called_once()
+    assert breaker.state == "open"
+
+    # a probe request reaching the envoy closes the breaker
+    mock_envoy.request.side_effect = None
+    freezer.tick(BREAKER_RESET_TIMEOUT)
+    result = await hass.services.async_call(
+        DOMAIN, "read_data", service_data, blocking=True, return_response=True
+    )
+    assert result
+    assert breaker.diagnostics == {
+        "state": "closed",
+        "consecutive_failures": 0,
+        "transitions": {"closed": 1, "half_open": 2, "open": 2},
+    }
+
+
+async def test_service_read_data_retry(
+    hass: HomeAssistant,
+    mock_envoy: AsyncMock,
+    config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test read_data service retrying connection errors within retry budget."""
+    await setup_integration(hass, config_entry)
+    assert config_entry.state is ConfigEntryState.LOADED
+    retry_policy = config_entry.runtime_data.retry_policy
+    retry_policy.budget = 2
+    service_data = {
+        ATTR_CONFIG_ENTRY_ID: config_entry.entry_id,
+        ATTR_ENDPOINT: "/ivp/meters",
+    }
+    reply = mock_envoy.request.return_value
+    mock_envoy.request.reset_mock()
+
+    with patch.object(EnvoyRetryPolicy, "delay", return_value=0):
+        # transient error is retried
+        mock_envoy.request.side_effect = [ClientError("Test"), reply]
+        result = await hass.services.async_call(
+            DOMAIN, "read_data", service_data, blocking=True, return_response=True
+        )
+        assert result
+        assert result[ATTR_METADATA]["retries"] == 1
+        assert mock_envoy.request.call_count == 2  # noqa: PLR2004
+        mock_envoy.request.reset_mock()
+
+        # no retries left in budget
+        mock_envoy.request.side_effect = ClientError("Test")
+        with pytest.raises(
+            HomeAssistantError, match="Error communicating with Envoy API on"
+        ):
+            await hass.services.async_call(
+                DOMAIN, "read_data", service_data, blocking=True, return_response=True
+            )
+        assert mock_envoy.request.call_count == 2  # noqa: PLR2004
+        mock_envoy.request.reset_mock()
+
+        # sending data is never retried
+        freezer.tick(RETRY_BUDGET_WINDOW)
+        with pytest.raises(
+            HomeAssistantError, match="Error communicating with Envoy API on"
+        ):
+            await hass.services.async_call(
+                DOMAIN,
+                "send_data",
+                {
+                    ATTR_CONFIG_ENTRY_ID: config_entry.entry_id,
+                    ATTR_ENDPOINT: "/tariff",
+                    ATTR_DATA: {"tariff": {"currency": {"code": "EUR"}}},
+                    ATTR_METHOD: "PUT",
+                    ATTR_RISK_ACKNOWLEDGED: True,
+                    ATTR_VALIDATE_MODE: False,
+                },
+                blocking=True,
+                return_response=True,
+            )
+        mock_envoy.request.assert_called_once()
+
+    assert retry_policy.diagnostics == {
+        "max_attempts": 3,
+        "budget": 2,
+        "budget_available": 2,
+        "retries": 2,
+        "budget_exhausted": 1,
+    }
+
+
+async def test_service_timeout(
+    hass: HomeAssistant,
+    mock_envoy: AsyncMock,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test read_data, read_many and send_data services with timeout."""
+    await setup_integration(hass, config_entry)
+    assert config_entry.state is ConfigEntryState.LOADED
+    coordinator = config_entry.runtime_data
+    coordinator.cache.set("/ivp/meters", [{"eid": 1}])
+
+    # envoy does not reply until cancelled
+    cancelled: list[str] = []
+
+    async def envoy_request(endpoint: str, *args: Any) -> None:
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append(endpoint)
+            raise
+
+    mock_envoy.request.side_effect = envoy_request
+    service_data = {
+        ATTR_CONFIG_ENTRY_ID: config_entry.entry_id,
+        ATTR_ENDPOINT: "/ivp/meters",
+        ATTR_TIMEOUT: 0.01,
+    }
+    with pytest.raises(
+        HomeAssistantError, match=r"No reply from Envoy API on .* within 0\.01 seconds"
+    ):
+        await hass.services.async_call(
+            DOMAIN, "read_data", service_data, blocking=True, return_response=True
+        )
+    await hass.async_block_till_done()
+    assert cancelled == ["/ivp/meters"]
+    assert not coordinator._in_flight  # noqa: SLF001
+
+    # cached data of any age is used when caller accepts cached data
+    result = await hass.services.async_call(
+        DOMAIN,
+        "read_data",
+        service_data | {ATTR_MAX_AGE: 0},
+        blocking=True,
+        return_response=True,
+    )
+    assert result
+    assert result["/ivp/meters"] == [{"eid": 1}]
+    assert result[ATTR_METADATA]["fallback"] == "timeout"
+
+    # each endpoint of read_many uses cached data or fails on its own
+    result = await hass.services.async_call(
+        DOMAIN,
+        "read_many",
+        {
+            ATTR_CONFIG_ENTRY_ID: config_entry.entry_id,
+            ATTR_ENDPOINTS: ["/ivp/meters", "/test"],
+            ATTR_MAX_AGE: 0,
+            ATTR_TIMEOUT: 0.01,
+        },
+        blocking=True,
+        return_response=True,
+    )
+    assert result
+    assert result["/ivp/meters"]["data"] == [{"eid": 1}]
+    assert result["/ivp/meters"][ATTR_METADATA]["fallback"] == "timeout"
+    assert result["/test"]["status"] == "error"
+    assert "within 0.01 seconds" in result["/test"]["error"]
+    await hass.async_block_till_done()
+    assert sorted(cancelled[2:]) == ["/ivp/meters", "/test"]
+    del cancelled[2:]
+
+    with pytest.raises(
+        HomeAssistantError, match=r"No reply from Envoy API on .* within 0\.01 seconds"
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            "send_data",
+            {
+                ATTR_CONFIG_ENTRY_ID: config_entry.entry_id,
+                ATTR_ENDPOINT: "/tariff",
+                ATTR_DATA: {"tariff": {"currency": {"code": "EUR"}}},
+                ATTR_METHOD: "PUT",
+                ATTR_RISK_ACKNOWLEDGED: True,
+                ATTR_VALIDATE_MODE: False,
+                ATTR_TIMEOUT: 0.01,
+            },
+            blocking=True,
+            return_response=True,
+        )
+    assert cancelled == ["/ivp/meters", "/ivp/meters", "/tariff"]
+    assert coordinator.scheduler.active == 0
+
+    # timeout raised by the envoy connection is not the call timeout
+    mock_envoy.request.side_effect = TimeoutError
+    with pytest.raises(
+        HomeAssistantError, match=r"Error communicating with Envoy API on .* timeout"
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            "send_data",
+            {
+                ATTR_CONFIG_ENTRY_ID: config_entry.entry_id,
+                ATTR_ENDPOINT: "/tariff",
+                ATTR_DATA: {"tariff": {"currency": {"code": "EUR"}}},
+                ATTR_METHOD: "PUT",
+                ATTR_RISK_ACKNOWLEDGED: True,
+                ATTR_VALIDATE_MODE: False,
+                ATTR_TIMEOUT: 5,
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+    # timeout must be more than 0
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN,
+            "read_data",
+            service_data | {ATTR_TIMEOUT: 0},
+            blocking=True,
+            return_response=True,
+        )
+
+
+async def test_service_read_history(
+    hass: HomeAssistant,
+    mock_envoy: AsyncMock,
+    config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test read_history service returning recent values of watched endpoint."""
+    freezer.move_to("2025-03-14T12:00:00+00:00")
+    await setup_integration(hass, config_entry)
+    assert config_entry.state is ConfigEntryState.LOADED
+    coordinator = config_entry.runtime_data
+    endpoint = "/api/v1/production/inverters"
+    service_data = {
+        ATTR_CONFIG_ENTRY_ID: config_entry.entry_id,
+        ATTR_ENDPOINT: endpoint,
+    }
+
+    with pytest.raises(ServiceValidationError, match="No history available for"):
+        await hass.services.async_call(
+            DOMAIN, "read_history", service_data, blocking=True, return_response=True
+        )
+
+    # keep last 2 replies, inverter 1002 missing in last reply
+    coordinator.history[endpoint] = EndpointHistory(2)
+    for watts in (100, 110, 120):
+        inverters = [
+            {"serialNumber": "1001", "lastReportWatts": watts, "producing": True},
+            {"serialNumber": "1002", "lastReportWatts": watts + 1, "producing": True},
+        ]
+        mock_envoy.request.return_value.read.return_value = orjson.dumps(
+            inverters[:1] if watts == 120 else inverters  # noqa: PLR2004
+        )
+        await coordinator.async_read(endpoint)
+        freezer.tick(60)
+
+    result = await hass.services.async_call(
+        DOMAIN,
+        "read_history",
+        service_data | {ATTR_PATHS: ["*.lastReportWatts"]},
+        blocking=True,
+        return_response=True,
+    )
+    assert result == {
+        endpoint: {
+            "time": ["2025-03-14T12:01:00+00:00", "2025-03-14T12:02:00+00:00"],
+            "values": {
+                "1001.lastReportWatts": [110.0, 120.0],
+                "1002.lastReportWatts": [111.0, None],
+            },
+        }
+    }
+
+    result = await hass.services.async_call(
+        DOMAIN,
+        "read_history",
+        service_data | {ATTR_PATHS: "1001.*", ATTR_DURATION: 90},
+        blocking=True,
+        return_response=True,
+    )
+    assert result == {
+        endpoint: {
+            "time": ["2025-03-14T12:02:00+00:00"],
+            "values": {"1001.lastReportWatts": [120.0]},
+        }
+    }
+    assert coordinator.history[endpoint].diagnostics == {
+        "size": 2,
+        "count": 2,
+        "series": 2,
+        "memory": 48,
+    }
+
+
+async def test_service_get_device(
+    hass: HomeAssistant,
+    mock_envoy: AsyncMock,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test get_device service returning one device record of an endpoint."""
+    await setup_integration(hass, config_entry)
+    assert config_entry.state is ConfigEntryState.LOADED
+    coordinator = config_entry.runtime_data
+
+    inverters = [
+        {"serialNumber": "1001", "lastReportWatts": 100},
+        {"serialNumber": "1002", "lastReportWatts": 110},
+    ]
+    mock_envoy.request.return_value.read.return_value = orjson.dumps(inverters)
+    mock_envoy.request.reset_mock()
+    service_data = {
+        ATTR_CONFIG_ENTRY_ID: config_entry.entry_id,
+        ATTR_ENDPOINT: "/api/v1/production/inverters",
+        ATTR_SERIAL: "1002",
+        ATTR_MAX_AGE: 0,
+    }
+    result = await hass.services.async_call(
+        DOMAIN, "get_device", service_data, blocking=True, return_response=True
+    )
+    assert result
+    assert result["1002"] == inverters[1]
+    assert result[ATTR_METADATA][ATTR_FROM_CACHE] is False
+    mock_envoy.request.assert_called_once()
+
+    # next lookup uses the index of the cached reply
+    mock_envoy.request.reset_mock()
+    result = await hass.services.async_call(
+        DOMAIN,
+        "get_device",
+        service_data | {ATTR_SERIAL: "1001", ATTR_MAX_AGE: 60},
+        blocking=True,
+        return_response=True,
+    )
+    assert result
+    assert result["1001"] == inverters[0]
+    assert result[ATTR_METADATA][ATTR_FROM_CACHE] is True
+    mock_envoy.request.assert_not_called()
+
+    # inventory lists the devices per device type
+    inventory = [
+        {"type": "PCU", "devices": [{"serial_num": "1001", "producing": True}]},
+        {"type": "ENCHARGE", "devices": [{"serial_num": "2001", "percentFull": 80}]},
+    ]
+    coordinator.cache.set("/inventory.json", inventory)
+    assert coordinator.cache.get("/inventory.json").index == {
+        "1001": {"serial_num": "1001", "producing": True},
+        "2001": {"serial_num": "2001", "percentFull": 80},
+    }
+    mock_envoy.request.reset_mock()
+    result = await hass.services.async_call(
+        DOMAIN,
+        "get_device",
+        service_data
+        | {ATTR_ENDPOINT: "/inventory.json", ATTR_SERIAL: "2001", ATTR_MAX_AGE: 60},
+        blocking=True,
+        return_response=True,
+    )
+    assert result
+    assert result["2001"] == {"serial_num": "2001", "percentFull": 80}
+    assert result[ATTR_METADATA][ATTR_FROM_CACHE] is True
+    mock_envoy.request.assert_not_called()
+
+    with pytest.raises(ServiceValidationError, match="Device 1003 in"):
+        await hass.services.async_call(
+            DOMAIN,
+            "get_device",
+            service_data | {ATTR_SERIAL: "1003", ATTR_MAX_AGE: 60},
+            blocking=True,
+            return_response=True,
+        )
+
+    with pytest.raises(ServiceValidationError, match="can not be looked up in /info"):
+        await hass.services.async_call(
+            DOMAIN,
+            "get_device",
+            service_data | {ATTR_ENDPOINT: "/info"},
+            blocking=True,
+            return_response=True,
+        )
+
+
+async def test_service_analyze_inverters(
+    hass: HomeAssistant,
+    mock_envoy: AsyncMock,
+    config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test analyze_inverters service returning inverter statistics."""
+    freezer.move_to("2025-03-14T12:00:00+00:00")
+    await setup_integration(hass, config_entry)
+    assert config_entry.state is ConfigEntryState.LOADED
+    now = int(dt_util.utcnow().timestamp())
+    freezer.tick(1)
+
+    # 9 inverters at 200 W, 1 at 50 W and 1 that stopped reporting 30 minutes ago
+    inverters = [
+        {
+            "serialNumber": f"10{index:02}",
+            "lastReportDate": now - 60,
+            "lastReportWatts": 50 if index == 9 else 200,  # noqa: PLR2004
+            "maxReportWatts": 300,
+        }
+        for index in range(10)
+    ] + [
+        {
+            "serialNumber": "1010",
+            "lastReportDate": now - 1800,
+            "lastReportWatts": 300,
+            "maxReportWatts": 300,
+        }
+    ]
+    mock_envoy.request.return_value.read.return_value = orjson.dumps(inverters)
+    service_data = {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id, ATTR_MAX_AGE: 0}
+    result = await hass.services.async_call(
+        DOMAIN, "analyze_inverters", service_data, blocking=True, return_response=True
+    )
+    assert result
+    assert result.pop(ATTR_METADATA)[ATTR_FROM_CACHE] is False
+    assert result == {
+        "inverters": 11,
+        "reporting": 10,
+        "total_watts": 1850.0,
+        "total_max_watts": 3000.0,
+        "mean_watts": 185.0,
+        "stdev_watts": 45.0,
+        "percentiles": {
+            "p10": 185.0,
+            "p25": 200.0,
+            "p50": 200.0,
+            "p75": 200.0,
+            "p90": 200.0,
+        },
+        "underperforming": [
+            {"serialNumber": "1009", "lastReportWatts": 50.0, "zscore": -3.0}
+        ],
+        "stale": [{"serialNumber": "1010", "lastReportDate": now - 1800, "age": 1801}],
+    }
+
+    # stricter zscore and longer stale time
+    result = await hass.services.async_call(
+        DOMAIN,
+        "analyze_inverters",
+        service_data | {ATTR_MAX_AGE: 60, ATTR_STALE_AFTER: 3600, ATTR_ZSCORE: 3.5},
+        blocking=True,
+        return_response=True,
+    )
+    assert result
+    assert result[ATTR_METADATA][ATTR_FROM_CACHE] is True
+    assert result["reporting"] == 11  # noqa: PLR2004
+    assert result["underperforming"] == []
+    assert result["stale"] == []
+
+    # reply that is not a list of inverters
+    mock_envoy.request.return_value.read.return_value = b'{"wattsNow": 100}'
+    freezer.tick(1)
+    with pytest.raises(HomeAssistantError, match="unexpected reply"):
+        await hass.services.async_call(
+            DOMAIN,
+            "analyze_inverters",
+            service_data,
+            blocking=True,
+            return_response=True,
+        )
+
+    # inverter record with a value that is not a number
+    mock_envoy.request.return_value.read.return_value = orjson.dumps(
+        [{"serialNumber": "1001", "lastReportWatts": "n/a"}]
+    )
+    freezer.tick(1)
+    with pytest.raises(
+        ServiceValidationError, match="Invalid inverter data from Envoy, inverter 1001"
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            "analyze_inverters",
+            service_data,
+            blocking=True,
+            return_response=True,
+        )
+
+
+def test_analyze_inverters_performance() -> None:
+    """Test analysis of a reply of 600 inverters takes a few milliseconds at most."""
+    now = 1741953600
+    inverters = [
+        {
+            "serialNumber": str(122212345000 + index),
+            "lastReportDate": now - index * 2,
+            "devType": 1,
+            "lastReportWatts": index % 300,
+            "maxReportWatts": 300,
+        }
+        for index in range(600)
+    ]
+    durations = []
+    for _ in range(5):
+        start = time.perf_counter()
+        result = analyze_inverters(inverters, now, stale_after=900, zscore=2)
+        durations.append(time.perf_counter() - start)
+    assert result["reporting"] == 451  # noqa: PLR2004
+    assert min(durations) < 0.005  # noqa: PLR2004
+
+
 async def test_service_send_data(
     hass: HomeAssistant,
     mock_envoy: AsyncMock,